@@ -0,0 +1,52 @@
+"""Scaling benchmark for nerdcal.parallel.
+
+Times each batch operation on N random ordinals with 1..W workers, reporting throughput and speedup relative to a single worker.
+
+Usage (from the repository root): python -m benchmarks.parallel_scaling [-n NUM_VALUES] [-w MAX_WORKERS] [--calendar {ifc,positivist,seasonal}]"""
+
+import argparse
+from array import array
+import os
+import random
+import time
+
+from nerdcal import batch
+from nerdcal.batch import CALENDARS
+from nerdcal.parallel import Pool
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description = __doc__.splitlines()[0])
+    parser.add_argument('-n', '--num-values', type = int, default = 1000000, help = 'number of values to convert')
+    parser.add_argument('-w', '--max-workers', type = int, default = os.cpu_count() or 1, help = 'maximum number of workers')
+    parser.add_argument('--calendar', choices = list(CALENDARS), default = 'ifc')
+    parser.add_argument('--threads', action = 'store_true', help = 'use threads rather than processes')
+    args = parser.parse_args()
+    cls = CALENDARS[args.calendar]
+    (lo, hi) = batch.ordinal_range(cls)
+    rng = random.Random(0)
+    ordinals = array('q', (rng.randint(lo, hi) for _ in range(args.num_values)))
+    strings = batch.isoformat(cls, ordinals)
+    timestamps = array('d', (rng.uniform(0, 4e9) for _ in range(args.num_values)))
+    operations = [
+        ('to_fields', lambda pool: pool.to_fields(cls, ordinals)),
+        ('isoformat', lambda pool: pool.isoformat(cls, ordinals)),
+        ('fromisoformat', lambda pool: pool.fromisoformat(cls, strings)),
+        ('from_timestamps', lambda pool: pool.from_timestamps(timestamps)),
+    ]
+    print(f'{args.num_values} values, calendar = {cls.__name__}, {"threads" if args.threads else "processes"}')
+    print(f'{"operation":<16} {"workers":>7} {"seconds":>9} {"values/s":>12} {"speedup":>8}')
+    for (name, op) in operations:
+        baseline = None
+        for workers in range(1, args.max_workers + 1):
+            with Pool(workers = workers, calendars = [cls], threads = args.threads or None) as pool:
+                op(pool)  # warm up (starts the workers and builds their tables)
+                start = time.perf_counter()
+                op(pool)
+                elapsed = time.perf_counter() - start
+            baseline = baseline or elapsed
+            print(f'{name:<16} {workers:>7d} {elapsed:>9.3f} {args.num_values / elapsed:>12,.0f} {baseline / elapsed:>7.2f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1 @@
+from nerdcal.instrument import disable_stats, enable_stats, profile, reset_stats, stats
@@ -0,0 +1,46 @@
+"""Command-line entry point: python -m nerdcal {serve,loadgen,verify} ..."""
+
+import argparse
+import asyncio
+import sys
+from typing import Optional, Sequence
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog = 'python -m nerdcal', description = 'nerdcal command-line tools.')
+    subparsers = parser.add_subparsers(dest = 'command', required = True)
+    from nerdcal.server import DEFAULT_CACHE_SIZE, DEFAULT_HOST, DEFAULT_PORT
+    serve_parser = subparsers.add_parser('serve', help = 'run the local HTTP/JSON conversion service')
+    serve_parser.add_argument('--host', default = DEFAULT_HOST, help = 'address to bind (default: %(default)s)')
+    serve_parser.add_argument('--port', type = int, default = DEFAULT_PORT, help = 'port to bind (default: %(default)s)')
+    serve_parser.add_argument('--cache-size', type = int, default = DEFAULT_CACHE_SIZE, help = 'size of the conversion cache (default: %(default)s)')
+    loadgen_parser = subparsers.add_parser('loadgen', help = 'generate load against a running conversion service')
+    loadgen_parser.add_argument('--host', default = DEFAULT_HOST, help = 'server address (default: %(default)s)')
+    loadgen_parser.add_argument('--port', type = int, default = DEFAULT_PORT, help = 'server port (default: %(default)s)')
+    loadgen_parser.add_argument('-c', '--connections', type = int, default = 16, help = 'number of concurrent keep-alive connections (default: %(default)s)')
+    loadgen_parser.add_argument('-n', '--requests', type = int, default = 10000, help = 'total number of requests (default: %(default)s)')
+    loadgen_parser.add_argument('--batch-size', type = int, default = 1, help = 'conversions per request; above 1, batches are POSTed (default: %(default)s)')
+    loadgen_parser.add_argument('--grid-fraction', type = float, default = 0.05, help = 'fraction of requests for calendar grids (default: %(default)s)')
+    subparsers.add_parser('verify', help = 'exhaustive round-trip verification (see python -m nerdcal verify --help)', add_help = False)
+    (args, rest) = parser.parse_known_args(argv)
+    if args.command == 'verify':
+        from nerdcal.verify import main as verify_main
+        return verify_main(rest)
+    if rest:
+        parser.error(f'unrecognized arguments: {" ".join(rest)}')
+    if args.command == 'serve':
+        from nerdcal.server import configure_caches, serve
+        configure_caches(args.cache_size)
+        try:
+            asyncio.run(serve(args.host, args.port))
+        except KeyboardInterrupt:
+            pass
+        return 0
+    from nerdcal.loadgen import report, run
+    summary = asyncio.run(run(args.host, args.port, args.connections, args.requests, args.batch_size, args.grid_fraction))
+    print(report(summary))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,9 +1,11 @@
 """Abstract base classes for dates and datetimes in different calendar systems."""
 
 from abc import ABC, abstractclassmethod, abstractmethod
+from dataclasses import fields, is_dataclass
 from datetime import date, datetime, time, timedelta, tzinfo
+import re
 import time as _time
-from typing import Any, List, Optional, Tuple, Union
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 
 #####################
@@ -37,6 +39,50 @@ def parse_isoformat_date(date_str: str) -> Tuple[int, int, int]:
     day = int(date_str[8:10])
     return (year, month, day)
 
+def year_and_day_of_year(n: int) -> Tuple[int, int]:
+    """Given an ordinal number (where day 1 is January 1 of year 1), returns the (year, n) pair, where n is the 0-up day of the year."""
+    n -= 1  # convert to 0-up
+    n400, n = divmod(n, DI400Y)
+    n100, n = divmod(n, DI100Y)
+    n4, n = divmod(n, DI4Y)
+    n1, n = divmod(n, DAYS_IN_YEAR)
+    year = n400 * 400 + n100 * 100 + n4 * 4 + n1 + 1
+    if (n1 == 4) or (n100 == 4):
+        # last day of a leap year
+        return (year - 1, DAYS_IN_YEAR)
+    return (year, n)
+
+def microsecond_of_day(t: time) -> int:
+    """Returns the number of microseconds since midnight of a time."""
+    return ((t.hour * 60 + t.minute) * 60 + t.second) * 1000000 + t.microsecond
+
+def format_directives(fmt: str, values: Dict[str, str], t: time) -> str:
+    """Expand the strftime-style directives in a format string.
+    Directives whose letter is in values are replaced by the corresponding value, '%%' becomes '%', and the time directives are delegated to t.strftime.
+    Raises a ValueError for any other directive."""
+    def replace(match: Any) -> str:
+        letter = match.group(1)
+        if letter in values:
+            return values[letter]
+        if letter == '%':
+            return '%'
+        if letter in _TIME_DIRECTIVES:
+            return t.strftime(match.group(0))
+        raise ValueError(f'unsupported strftime directive: {match.group(0)!r}')
+    return _DIRECTIVE_REGEX.sub(replace, fmt)
+
+def _has_fields(cls: type, names: Tuple[str, ...]) -> bool:
+    """Returns True if cls is a dataclass whose fields are exactly the given names (in order)."""
+    has = _HAS_FIELDS.get((cls, names))
+    if has is None:
+        has = _HAS_FIELDS[(cls, names)] = bool(names) and is_dataclass(cls) and (tuple(field.name for field in fields(cls)) == names)
+    return has
+
+_HAS_FIELDS: Dict[Tuple[type, Tuple[str, ...]], bool] = {}
+
+_DIRECTIVE_REGEX = re.compile('%(.)', re.DOTALL)
+_TIME_DIRECTIVES = frozenset('HIMSfpzZ')
+
 DI400Y = days_before_year(401)    # number of days in 400 years
 DI100Y = days_before_year(101)    # number of days in 100 years
 DI4Y   = days_before_year(5)      # number of days in 4 years
@@ -67,6 +113,12 @@ class Date(ABC):
     def weekday_abbrevs(cls) -> List[str]:
         """Abbreviated names of each weekday (3 letters, for use with ctime())."""
 
+    @classmethod
+    def intercalary_names(cls) -> Dict[int, str]:
+        """Names of the intercalary days (days belonging to no week), keyed by their weekday() values.
+        By default, there are none."""
+        return {}
+
     # Additional constructors
 
     @classmethod
@@ -87,18 +139,7 @@ class Date(ABC):
     @classmethod
     def fromordinal(cls, n: int) -> 'Date':
         """Construct a Date from an ordinal number, where day 1 is January 1 of year 1."""
-        n -= 1  # convert to 0-up
-        n400, n = divmod(n, DI400Y)
-        n100, n = divmod(n, DI100Y)
-        n4, n = divmod(n, DI4Y)
-        n1, n = divmod(n, DAYS_IN_YEAR)
-        year = n400 * 400 + n100 * 100 + n4 * 4 + n1 + 1
-        if (n1 == 4) or (n100 == 4):
-            # last day of a leap year
-            return cls._from_year_and_ordinal(year - 1, DAYS_IN_YEAR)
-        leapyear = n1 == 3 and (n4 != 24 or n100 == 3)
-        assert leapyear == is_leap_year(year)
-        return cls._from_year_and_ordinal(year, n)
+        return cls._from_year_and_ordinal(*year_and_day_of_year(n))
 
     @abstractclassmethod
     def fromisoformat(cls, date_string: str) -> 'Date':
@@ -166,9 +207,60 @@ class Date(ABC):
         date_str = self._ctime_date()
         return '{} 00:00:00 {:04d}'.format(date_str, self.get_year())
 
-    @abstractmethod
+    def _period_and_day(self) -> Tuple[int, int]:
+        """Return the period (e.g. month) and day of the period.
+        By default, these are parsed from isoformat()."""
+        iso = self.isoformat()
+        return (int(iso[5:7]), int(iso[8:10]))
+
+    @classmethod
+    def _period_names(cls) -> List[str]:
+        """Full names of each period (e.g. month).
+        If empty (the default), the %B directive is unsupported."""
+        return []
+
+    @classmethod
+    def _period_abbrevs(cls) -> List[str]:
+        """Abbreviated names of each period (e.g. month).
+        If empty (the default), the %b directive is unsupported."""
+        return []
+
+    def _strftime_values(self) -> Dict[str, str]:
+        """Values of the calendar-specific strftime directives, keyed by directive letter."""
+        year = self.get_year()
+        (period, day) = self._period_and_day()
+        weekday = self.weekday()
+        intercalary = self.intercalary_names()
+        values = {
+            'Y': f'{year:04d}',
+            'y': f'{year % 100:02d}',
+            'm': f'{period:02d}',
+            'd': f'{day:02d}',
+            'A': intercalary[weekday] if (weekday in intercalary) else self.weekday_names()[weekday],
+            'a': intercalary[weekday] if (weekday in intercalary) else self.weekday_abbrevs()[weekday],
+            'w': str(weekday),
+            'j': f'{self.toordinal() - type(self)(year, 1, 1).toordinal() + 1:03d}',
+        }
+        (names, abbrevs) = (self._period_names(), self._period_abbrevs())
+        if names:
+            values['B'] = names[period - 1]
+        if abbrevs:
+            values['b'] = abbrevs[period - 1]
+        return values
+
     def strftime(self, fmt: str) -> str:
-        "Format using strftime()."
+        """Format using strftime().
+
+        The date directives are interpreted in the calendar:
+            %Y, %y: year (4 or 2 digits)
+            %m, %B, %b: period (e.g. month) number, name, and abbreviation
+            %d: day of the period
+            %A, %a: weekday name and abbreviation (or the full name of an intercalary day)
+            %w: weekday() number
+            %j: day of the year
+        The time directives (%H, %I, %M, %S, %f, %p, %z, %Z) are rendered for midnight, as by datetime.time.strftime.
+        Any other directive (e.g. %c, %x, %U) raises a ValueError, since the standard library would render it for a Gregorian date."""
+        return format_directives(fmt, self._strftime_values(), time())
 
     @abstractmethod
     def isoformat(self) -> str:
@@ -179,6 +271,20 @@ class Date(ABC):
     def __str__(self) -> str:
         return self.isoformat()
 
+    # Pickling
+
+    # dataclass fields of a concrete calendar class (subclass should set this to enable compact pickling)
+    _pickle_fields: Tuple[str, ...] = ()
+
+    def __reduce_ex__(self, protocol: int) -> Any:
+        """Pickle compactly as (class, ordinal), if the class's fields are exactly those of its calendar (see _pickle_fields).
+        Unpickling reconstructs the fields from lookup tables, without re-running validation.
+        Other subclasses (e.g. with extra fields) are pickled as usual."""
+        if not _has_fields(type(self), self._pickle_fields):
+            return super().__reduce_ex__(protocol)
+        from nerdcal.batch import _restore_date
+        return (_restore_date, (type(self), self.toordinal()))
+
 
 class Datetime(ABC):
     """Date/time type for arbitrary calendar, analogous to datetime.datetime."""
@@ -321,6 +427,11 @@ class Datetime(ABC):
     def ctime(self) -> str:
         "Return ctime() style string."
 
+    def strftime(self, fmt: str) -> str:
+        """Format using strftime().
+        Date directives are interpreted in the calendar, and time directives are rendered as by datetime.time.strftime (see Date.strftime)."""
+        return format_directives(fmt, self.date()._strftime_values(), self.timetz())
+
     @abstractmethod
     def isoformat(self, sep: str = 'T', timespec: str = 'auto') -> str:
         """Return the time formatted according to ISO.
@@ -341,3 +452,17 @@ class Datetime(ABC):
     def __str__(self) -> str:
         "Convert to string, for str()."
         return self.isoformat(sep = ' ')
+
+    # Pickling
+
+    def __reduce_ex__(self, protocol: int) -> Any:
+        """Pickle compactly as (class, ordinal, microsecond of the day[, tzinfo]), if the class's fields are exactly those of its date class followed by the time fields.
+        Unpickling reconstructs the fields from lookup tables, without re-running validation.
+        Other subclasses (e.g. with extra fields) are pickled as usual."""
+        date_fields = self._date_class._pickle_fields
+        if not (date_fields and _has_fields(type(self), date_fields + ('hour', 'minute', 'second', 'microsecond', 'tzinfo'))):
+            return super().__reduce_ex__(protocol)
+        from nerdcal.batch import _restore_datetime
+        t = self.timetz()
+        args = (type(self), self.date().toordinal(), microsecond_of_day(t))
+        return (_restore_datetime, args if (t.tzinfo is None) else args + (t.tzinfo,))
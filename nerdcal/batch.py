@@ -0,0 +1,246 @@
+"""Batch conversion between ordinals and calendar fields.
+
+The scalar API constructs (and validates) one Date object per value. For bulk work, the functions here operate on whole sequences of ordinals using per-calendar lookup tables, which are built once per process from the scalar implementation itself:
+
+    - the ordinal of the first day of each year
+    - for leap and non-leap years, the (period, day) fields, weekday, and ISO month/day suffix of every day of the year
+
+Here "period" is the month (IFC, Positivist) or season (Seasonal).
+
+The layout of each year is taken from the years 1 (non-leap) and 4 (leap), so this assumes that a calendar's year layout depends only on whether the year is a leap year, which holds for all the calendars in this package. A Date subclass whose _days_in_month (or similar) varies in some other way must not use these functions. nerdcal.verify checks the tables against the scalar implementation for every ordinal.
+
+The *_into functions write into preallocated output sequences (anything supporting integer index assignment, e.g. array.array or a memoryview), over the index range [start, stop). These are the kernels used by nerdcal.parallel."""
+
+from array import array
+from bisect import bisect
+from dataclasses import fields
+from datetime import tzinfo
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple, Type
+
+from nerdcal._base import Date, Datetime, days_before_year, is_leap_year
+from nerdcal.ifc import IFCDate
+from nerdcal.positivist import PositivistDate
+from nerdcal.seasonal import SeasonalDate
+
+# calendar name -> Date class
+CALENDARS: Dict[str, Type[Date]] = {'ifc': IFCDate, 'positivist': PositivistDate, 'seasonal': SeasonalDate}
+US_PER_DAY = 86400 * 1000000
+EPOCH_ORDINAL = 719163  # ordinal of 1970-01-01
+ISO_WIDTH = 10  # length of a YYYY-MM-DD string
+
+
+##########
+# TABLES #
+##########
+
+class CalendarTables(NamedTuple):
+    """Lookup tables for a single calendar."""
+    # number of days by which ordinals are shifted before splitting into years (11 for the Seasonal calendar)
+    shift: int
+    # range of valid ordinals
+    min_ordinal: int
+    max_ordinal: int
+    # year_start[y] = days_before_year(y + 1), for y = 0..MAX_YEAR + 1 (so bisect gives the year directly)
+    year_start: array
+    # indexed by is_leap_year, then by 0-up day of year
+    periods: Tuple[bytes, bytes]
+    days: Tuple[bytes, bytes]
+    weekdays: Tuple[bytes, bytes]
+    suffixes: Tuple[List[bytes], List[bytes]]
+    # indexed by is_leap_year, maps b'-PP-DD' to 0-up day of year
+    suffix_index: Tuple[Dict[bytes, int], Dict[bytes, int]]
+
+_TABLES: Dict[Type[Date], CalendarTables] = {}
+
+def _build_tables(cls: Type[Date]) -> CalendarTables:
+    shift = 1 - cls.min.toordinal()
+    max_year = cls.max.get_year()
+    year_start = array('q', (days_before_year(y) for y in range(1, max_year + 3)))
+    (periods, days, weekdays, suffixes, suffix_index) = ([], [], [], [], [])
+    # the layout of a year is assumed to depend only on whether it is a leap year (see the module docstring)
+    for year in (1, 4):  # non-leap, leap
+        dates = [cls._from_year_and_ordinal(year, n) for n in range(days_before_year(year + 1) - days_before_year(year))]
+        fields = [tuple(int(s) for s in d.isoformat().split('-')[1:]) for d in dates]
+        periods.append(bytes(p for (p, _) in fields))
+        days.append(bytes(d for (_, d) in fields))
+        weekdays.append(bytes(d.weekday() for d in dates))
+        suffixes.append([d.isoformat()[4:].encode('ascii') for d in dates])
+        suffix_index.append({suffix: n for (n, suffix) in enumerate(suffixes[-1])})
+    return CalendarTables(shift, cls.min.toordinal(), cls.max.toordinal(), year_start, tuple(periods), tuple(days), tuple(weekdays), tuple(suffixes), tuple(suffix_index))
+
+def tables(cls: Type[Date]) -> CalendarTables:
+    """Get the lookup tables for a Date class, building them on first use."""
+    tbl = _TABLES.get(cls)
+    if tbl is None:
+        tbl = _TABLES[cls] = _build_tables(cls)
+    return tbl
+
+def ordinal_range(cls: Type[Date]) -> Tuple[int, int]:
+    """Return the (min, max) ordinals representable by a Date class."""
+    tbl = tables(cls)
+    return (tbl.min_ordinal, tbl.max_ordinal)
+
+
+###########
+# KERNELS #
+###########
+
+def _ordinal_error(cls: Type[Date], n: int) -> ValueError:
+    (lo, hi) = ordinal_range(cls)
+    return ValueError(f'ordinal must be in {lo}..{hi} for {cls.__name__}', n)
+
+_Locator = Callable[[int], Tuple[int, bool, int]]
+
+_LOCATORS: Dict[Type[Date], _Locator] = {}
+
+def _locator(cls: Type[Date]) -> _Locator:
+    """Get a function mapping an ordinal to (year, is_leap_year(year), 0-up day of the year) for a Date class, raising ValueError if the ordinal is out of range.
+    The table lookups are bound in a closure, since this is the inner loop of every kernel."""
+    locate = _LOCATORS.get(cls)
+    if locate is None:
+        tbl = tables(cls)
+        (lo, hi, year_start, shift) = (tbl.min_ordinal, tbl.max_ordinal, tbl.year_start, tbl.shift - 1)
+        def locate(n: int) -> Tuple[int, bool, int]:
+            if not lo <= n <= hi:
+                raise _ordinal_error(cls, n)
+            n += shift
+            year = bisect(year_start, n)
+            return (year, is_leap_year(year), n - year_start[year - 1])
+        _LOCATORS[cls] = locate
+    return locate
+
+def _field_names(cls: type) -> Tuple[str, ...]:
+    names = _FIELD_NAMES.get(cls)
+    if names is None:
+        names = _FIELD_NAMES[cls] = tuple(field.name for field in fields(cls))
+    return names
+
+_FIELD_NAMES: Dict[type, Tuple[str, ...]] = {}
+
+def _date_fields(cls: Type[Date], n: int) -> Tuple[int, int, int]:
+    (year, leap, k) = _locator(cls)(n)
+    tbl = tables(cls)
+    return (year, tbl.periods[leap][k], tbl.days[leap][k])
+
+def date_from_ordinal(cls: Type[Date], n: int) -> Date:
+    """Construct a Date from an ordinal using the lookup tables.
+    Since the fields come from the tables, they are valid by construction, so the dataclass validation is skipped."""
+    obj = object.__new__(cls)
+    obj.__dict__.update(zip(_field_names(cls), _date_fields(cls, n)))
+    return obj
+
+def datetime_from_ordinal(cls: Type[Datetime], n: int, us: int, tz: Optional[tzinfo] = None) -> Datetime:
+    """Construct a Datetime from an ordinal, the microsecond of the day, and a tzinfo, skipping the dataclass validation (see date_from_ordinal)."""
+    if not 0 <= us < US_PER_DAY:
+        raise ValueError(f'microsecond of the day must be in 0..{US_PER_DAY - 1}', us)
+    (seconds, microsecond) = divmod(us, 1000000)
+    (minutes, second) = divmod(seconds, 60)
+    (hour, minute) = divmod(minutes, 60)
+    obj = object.__new__(cls)
+    obj.__dict__.update(zip(_field_names(cls), (*_date_fields(cls._date_class, n), hour, minute, second, microsecond, tz)))
+    return obj
+
+# Pickle reconstructors (see Date.__reduce__ and Datetime.__reduce__)
+
+def _restore_date(cls: Type[Date], n: int) -> Date:
+    return date_from_ordinal(cls, n)
+
+def _restore_datetime(cls: Type[Datetime], n: int, us: int, tz: Optional[tzinfo] = None) -> Datetime:
+    return datetime_from_ordinal(cls, n, us, tz)
+
+def fields_into(cls: Type[Date], ordinals: Sequence[int], years, periods, days, start: int = 0, stop: Optional[int] = None) -> None:
+    """Convert ordinals[start:stop] to (year, period, day) fields, written to the same indices of the output sequences."""
+    tbl = tables(cls)
+    locate = _locator(cls)
+    (periods_by_leap, days_by_leap) = (tbl.periods, tbl.days)
+    for i in range(start, len(ordinals) if (stop is None) else stop):
+        (year, leap, k) = locate(ordinals[i])
+        years[i] = year
+        periods[i] = periods_by_leap[leap][k]
+        days[i] = days_by_leap[leap][k]
+
+def weekdays_into(cls: Type[Date], ordinals: Sequence[int], weekdays, start: int = 0, stop: Optional[int] = None) -> None:
+    """Compute weekday() for the dates with ordinals[start:stop], written to the same indices of the output sequence."""
+    locate = _locator(cls)
+    weekdays_by_leap = tables(cls).weekdays
+    for i in range(start, len(ordinals) if (stop is None) else stop):
+        (_, leap, k) = locate(ordinals[i])
+        weekdays[i] = weekdays_by_leap[leap][k]
+
+def isoformat_into(cls: Type[Date], ordinals: Sequence[int], out, start: int = 0, stop: Optional[int] = None) -> None:
+    """Render the dates with ordinals[start:stop] as ASCII ISO strings, into the byte buffer out (ISO_WIDTH bytes per value, at the same indices)."""
+    locate = _locator(cls)
+    suffixes = tables(cls).suffixes
+    for i in range(start, len(ordinals) if (stop is None) else stop):
+        (year, leap, k) = locate(ordinals[i])
+        j = i * ISO_WIDTH
+        out[j:j + ISO_WIDTH] = b'%04d' % year + suffixes[leap][k]
+
+def fromisoformat_into(cls: Type[Date], data, ordinals, start: int = 0, stop: Optional[int] = None) -> None:
+    """Parse the ASCII ISO strings with indices [start, stop) in the byte buffer data (ISO_WIDTH bytes per value), writing their ordinals to the same indices of the output sequence."""
+    tbl = tables(cls)
+    (year_start, shift, suffix_index) = (tbl.year_start, tbl.shift, tbl.suffix_index)
+    max_year = len(year_start) - 2
+    for i in range(start, len(data) // ISO_WIDTH if (stop is None) else stop):
+        j = i * ISO_WIDTH
+        s = bytes(data[j:j + ISO_WIDTH])
+        year = int(s[:4]) if s[:4].isdigit() else 0
+        k = suffix_index[is_leap_year(year)].get(s[4:]) if (1 <= year <= max_year) else None
+        if k is None:
+            raise ValueError(f'Invalid isoformat string for {cls.__name__}: {s.decode("ascii", "replace")!r}')
+        ordinals[i] = year_start[year - 1] + k + 1 - shift
+
+def timestamps_into(timestamps: Sequence[float], ordinals, microseconds, start: int = 0, stop: Optional[int] = None) -> None:
+    """Split POSIX timestamps[start:stop] (interpreted in UTC, rounded to the nearest microsecond) into the ordinal of the day and the microsecond of the day."""
+    for i in range(start, len(timestamps) if (stop is None) else stop):
+        (days, us) = divmod(round(timestamps[i] * 1000000), US_PER_DAY)
+        ordinals[i] = days + EPOCH_ORDINAL
+        microseconds[i] = us
+
+
+############
+# WRAPPERS #
+############
+
+def to_fields(cls: Type[Date], ordinals: Sequence[int]) -> Tuple[array, array, array]:
+    """Convert a sequence of ordinals to (years, periods, days) arrays."""
+    (years, periods, days) = (array('q', bytes(8 * len(ordinals))) for _ in range(3))
+    fields_into(cls, ordinals, years, periods, days)
+    return (years, periods, days)
+
+def weekdays(cls: Type[Date], ordinals: Sequence[int]) -> array:
+    """Compute the weekday() of each date in a sequence of ordinals."""
+    out = array('b', bytes(len(ordinals)))
+    weekdays_into(cls, ordinals, out)
+    return out
+
+def isoformat(cls: Type[Date], ordinals: Sequence[int]) -> List[str]:
+    """Render a sequence of ordinals as ISO strings."""
+    out = bytearray(ISO_WIDTH * len(ordinals))
+    isoformat_into(cls, ordinals, out)
+    return split_iso(out)
+
+def fromisoformat(cls: Type[Date], strings: Sequence[str]) -> array:
+    """Parse a sequence of ISO strings into an array of ordinals."""
+    ordinals = array('q', bytes(8 * len(strings)))
+    fromisoformat_into(cls, join_iso(strings), ordinals)
+    return ordinals
+
+def from_timestamps(timestamps: Sequence[float]) -> Tuple[array, array]:
+    """Split a sequence of POSIX timestamps (in UTC) into (ordinals, microseconds of the day) arrays."""
+    (ordinals, microseconds) = (array('q', bytes(8 * len(timestamps))) for _ in range(2))
+    timestamps_into(timestamps, ordinals, microseconds)
+    return (ordinals, microseconds)
+
+def join_iso(strings: Sequence[str]) -> bytes:
+    """Pack ISO date strings into a byte buffer, ISO_WIDTH bytes each."""
+    data = ''.join(strings).encode('ascii')
+    if len(data) != ISO_WIDTH * len(strings):
+        bad = next(s for s in strings if len(s) != ISO_WIDTH)
+        raise ValueError(f'Invalid isoformat string: {bad!r}')
+    return data
+
+def split_iso(data) -> List[str]:
+    """Unpack a byte buffer of ISO date strings, ISO_WIDTH bytes each."""
+    text = bytes(data).decode('ascii')
+    return [text[j:j + ISO_WIDTH] for j in range(0, len(text), ISO_WIDTH)]
@@ -0,0 +1,89 @@
+"""Coarse cached clocks.
+
+Date.today() and Datetime.now() convert the current time from scratch (with validation) on every call. A Clock caches its most recent results: today() recomputes only when the (local) day changes, and now()/utcnow() only when the second changes, filling in the microseconds without re-validating.
+
+Each cache is an immutable tuple which is replaced as a whole, so a Clock can be shared between threads without locking (at worst, two threads both recompute the same value).
+
+The time source (time.time by default) can be replaced, e.g. by a fake clock in tests.
+
+Example:
+
+    clock = Clock(SeasonalDatetime)
+    clock.today()  # same as SeasonalDate.today()
+    clock.now()    # same as SeasonalDatetime.now()"""
+
+from datetime import datetime, time, timedelta, timezone, tzinfo
+import math
+import time as _time
+from typing import Callable, Dict, Optional, Tuple, Type
+
+from nerdcal._base import Date, Datetime
+from nerdcal.ifc import IFCDatetime
+from nerdcal.positivist import PositivistDatetime
+from nerdcal.seasonal import SeasonalDatetime
+
+# key for the utcnow() cache (distinct from any tzinfo)
+_UTC_NAIVE = 'utc'
+# maximum number of timezones whose current second is cached (beyond which the cache is cleared)
+MAX_CACHED_ZONES = 16
+
+
+class Clock:
+    """Cached source of the current Date/Datetime in a calendar, given by its Datetime class."""
+
+    def __init__(self, calendar: Type[Datetime] = IFCDatetime, time_source: Callable[[], float] = _time.time) -> None:
+        self.calendar = calendar
+        self.time_source = time_source
+        # (start timestamp, end timestamp, Date) for the current local day
+        self._day: Optional[Tuple[float, float, Date]] = None
+        # tzinfo (or _UTC_NAIVE) -> (second, Datetime at the start of that second), for at most MAX_CACHED_ZONES keys
+        self._seconds: Dict[object, Tuple[int, Datetime]] = {}
+
+    def today(self) -> Date:
+        """Return the current local date (like Date.today())."""
+        t = self.time_source()
+        day = self._day
+        if (day is None) or not (day[0] <= t < day[1]):
+            local = datetime.fromtimestamp(t).date()
+            start = datetime.combine(local, time()).timestamp()
+            end = datetime.combine(local + timedelta(days = 1), time()).timestamp()
+            day = (start, end, self.calendar._date_class.fromdate(local))
+            self._day = day
+        return day[2]
+
+    def _now(self, key: object, tz: Optional[tzinfo]) -> Datetime:
+        t = self.time_source()
+        second = math.floor(t)
+        # round to the nearest microsecond, like datetime.fromtimestamp
+        microsecond = round((t - second) * 1000000)
+        if microsecond >= 1000000:
+            (second, microsecond) = (second + 1, microsecond - 1000000)
+        seconds = self._seconds
+        cached = seconds.get(key)
+        if (cached is None) or (cached[0] != second):
+            if key is _UTC_NAIVE:
+                dt = datetime.fromtimestamp(second, timezone.utc).replace(tzinfo = None)
+            else:
+                dt = datetime.fromtimestamp(second, tz)
+            cached = (second, self.calendar.fromdatetime(dt))
+            if (key not in seconds) and (len(seconds) >= MAX_CACHED_ZONES):
+                seconds = self._seconds = {}
+            seconds[key] = cached
+        # copy the cached value with the microseconds filled in (the fields are already validated)
+        obj = object.__new__(self.calendar)
+        obj.__dict__.update(cached[1].__dict__)
+        obj.__dict__['microsecond'] = microsecond
+        return obj
+
+    def now(self, tz: Optional[tzinfo] = None) -> Datetime:
+        """Return the current local time, or the current time in the given timezone (like Datetime.now(tz))."""
+        return self._now(tz, tz)
+
+    def utcnow(self) -> Datetime:
+        """Return the current UTC time as a naive Datetime (like Datetime.utcnow())."""
+        return self._now(_UTC_NAIVE, None)
+
+
+IFC_CLOCK = Clock(IFCDatetime)
+POSITIVIST_CLOCK = Clock(PositivistDatetime)
+SEASONAL_CLOCK = Clock(SeasonalDatetime)
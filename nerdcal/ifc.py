@@ -7,7 +7,7 @@ from dataclasses import dataclass
 from datetime import time, timedelta, tzinfo
 from itertools import accumulate
 from operator import add
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 
 from nerdcal._base import check_int, Date, Datetime, days_before_year, is_leap_year, parse_isoformat_date
 
@@ -27,6 +27,8 @@ class IFCDate(Date):
     There are 13 months, consisting of 28 days each.
     The additional month, Sol, occurs between June and July.
     However, for simplicity, Year Day will be represented as December 29, and Leap Day will be represented as June 29."""
+    _pickle_fields = ('year', 'month', 'day')
+
     year: int
     month: int
     day: int
@@ -50,6 +52,9 @@ class IFCDate(Date):
     def get_year(self) -> int:
         return self.year
 
+    def _period_and_day(self) -> Tuple[int, int]:
+        return (self.month, self.day)
+
     # Helpers
 
     @classmethod
@@ -82,6 +87,18 @@ class IFCDate(Date):
     def weekday_abbrevs(cls) -> List[str]:
         return ['Sun', 'Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat']
 
+    @classmethod
+    def intercalary_names(cls) -> Dict[int, str]:
+        return {7: 'Year Day', 8: 'Leap Day'}
+
+    @classmethod
+    def _period_names(cls) -> List[str]:
+        return cls.month_names()
+
+    @classmethod
+    def _period_abbrevs(cls) -> List[str]:
+        return cls.month_abbrevs()
+
     # Additional constructors
 
     @classmethod
@@ -116,7 +133,8 @@ class IFCDate(Date):
             return 8
         day_of_year = self.toordinal() - days_before_year(self.year)
         if (self.month >= 7) and self.is_leap_year():
-            return day_of_year % DAYS_IN_WEEK
+            # skip over Leap Day
+            return (day_of_year - 2) % DAYS_IN_WEEK
         return (day_of_year - 1) % DAYS_IN_WEEK
 
     # Conversions to string
@@ -131,10 +149,6 @@ class IFCDate(Date):
         month_name = self.month_abbrevs()[self.month - 1]
         return '{} {} {:2d}'.format(weekday_name, month_name, self.day)
 
-    def strftime(self, fmt: str) -> str:
-        # TODO: revamp strftime to handle IFC month/day numbers/names
-        raise NotImplementedError
-
     def isoformat(self) -> str:
         return f'{self.year:04d}-{self.month:02d}-{self.day:02d}'
 
@@ -0,0 +1,249 @@
+"""Sorted ordinal index for calendar range queries.
+
+A DateIndex holds a sorted array of ordinals, together with the "payload position" of each one (e.g. its row number in some external list of records).
+Queries are posed in the terms of the index's calendar (year, month/season, week, day, intercalary days) and answered by binary search, returning the matching positions in date order.
+
+Since ordinals are the same in every calendar, with_calendar gives a view of the same data in another calendar without re-sorting.
+
+Example:
+
+    index = DateIndex.from_dates(ifc_dates)
+    sol = index.period(2024, 7)  # positions of all dates in Sol 2024
+    midseason = index.with_calendar(SeasonalDate).period_day(37, 2015, 2024)"""
+
+from array import array
+from bisect import bisect_left
+from itertools import chain
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Type, Union
+
+from nerdcal import batch
+from nerdcal._base import Date, is_leap_year
+
+# minimum number of pending insertions before they are merged into the sorted arrays
+MIN_MERGE_SIZE = 1024
+
+DateOrOrdinal = Union[Date, int]
+
+
+###########
+# HELPERS #
+###########
+
+class _YearLayout:
+    """Layout of a calendar's year, derived from the lookup tables in nerdcal.batch.
+    Each attribute is a pair indexed by is_leap_year."""
+
+    def __init__(self, cls: Type[Date]) -> None:
+        tbl = batch.tables(cls)
+        days_in_week = len(cls.weekday_names())
+        self.periods = tbl.periods
+        self.days = tbl.days
+        # 0-up days of the year which are not part of any week
+        self.intercalary = tuple([k for (k, wd) in enumerate(weekdays) if wd >= days_in_week] for weekdays in tbl.weekdays)
+        # 1-up week of the period for each day of the year (0 for intercalary days)
+        weeks = []
+        for leap in (0, 1):
+            (week_of_day, count, prev_period) = ([], 0, None)
+            for (k, period) in enumerate(tbl.periods[leap]):
+                if period != prev_period:
+                    (count, prev_period) = (0, period)
+                if tbl.weekdays[leap][k] >= days_in_week:
+                    week_of_day.append(0)
+                else:
+                    week_of_day.append(count // days_in_week + 1)
+                    count += 1
+            weeks.append(bytes(week_of_day))
+        self.weeks = tuple(weeks)
+
+_LAYOUTS: Dict[Type[Date], _YearLayout] = {}
+
+def _layout(cls: Type[Date]) -> _YearLayout:
+    layout = _LAYOUTS.get(cls)
+    if layout is None:
+        layout = _LAYOUTS[cls] = _YearLayout(cls)
+    return layout
+
+class _Entries:
+    """The contents of an index (shared by all of its calendar views): sorted arrays of ordinals and payload positions, plus buffered (ordinal, position) insertions."""
+
+    def __init__(self) -> None:
+        self.ordinals = array('q')
+        self.positions = array('q')
+        self.pending: List[Tuple[int, int]] = []
+
+def _to_ordinal(value: DateOrOrdinal) -> int:
+    return value.toordinal() if isinstance(value, Date) else value
+
+
+#########
+# INDEX #
+#########
+
+class DateIndex:
+    """Sorted index of dates (by ordinal) with payload positions, for a given calendar (Date class).
+
+    New entries are buffered by add and merged into the sorted arrays in batches (just before the next query, or once enough have accumulated)."""
+
+    def __init__(self, calendar: Type[Date], values: Iterable[DateOrOrdinal] = (), positions: Optional[Iterable[int]] = None) -> None:
+        """Construct an index from dates or ordinals, with corresponding payload positions (by default, 0, 1, 2, ...)."""
+        self.calendar = calendar
+        self._entries = _Entries()
+        self.add(values, positions)
+        self.flush()
+
+    @classmethod
+    def from_dates(cls, dates: Sequence[Date], calendar: Optional[Type[Date]] = None) -> 'DateIndex':
+        """Construct an index of a sequence of dates, where the payload positions are indices into the sequence.
+        The calendar defaults to the type of the first date."""
+        if calendar is None:
+            if not dates:
+                raise ValueError('calendar is required for an empty sequence of dates')
+            calendar = type(dates[0])
+        return cls(calendar, dates)
+
+    def with_calendar(self, calendar: Type[Date]) -> 'DateIndex':
+        """Return a view of the same index, queried in another calendar.
+        The contents are shared, not copied, so entries added to either one are visible in both."""
+        index = object.__new__(type(self))
+        index.calendar = calendar
+        index._entries = self._entries
+        return index
+
+    # Insertion
+
+    def add(self, values: Iterable[DateOrOrdinal], positions: Optional[Iterable[int]] = None) -> None:
+        """Add dates or ordinals, with corresponding payload positions (by default, consecutive integers following the current number of entries)."""
+        ordinals = [_to_ordinal(value) for value in values]
+        if positions is None:
+            start = len(self)
+            positions = range(start, start + len(ordinals))
+        else:
+            positions = list(positions)
+            if len(positions) != len(ordinals):
+                raise ValueError('number of positions must match number of values')
+        entries = self._entries
+        entries.pending.extend(zip(ordinals, positions))
+        if len(entries.pending) >= max(MIN_MERGE_SIZE, len(entries.ordinals) // 8):
+            self.flush()
+
+    def flush(self) -> None:
+        """Merge any pending insertions into the sorted arrays."""
+        entries = self._entries
+        if not entries.pending:
+            return
+        entries.pending.sort()
+        # the concatenation consists of two sorted runs, which sorted() merges in linear time
+        pairs = sorted(chain(zip(entries.ordinals, entries.positions), entries.pending))
+        entries.ordinals = array('q', [n for (n, _) in pairs])
+        entries.positions = array('q', [pos for (_, pos) in pairs])
+        entries.pending = []
+
+    # Accessors
+
+    def __len__(self) -> int:
+        return len(self._entries.ordinals) + len(self._entries.pending)
+
+    @property
+    def ordinals(self) -> array:
+        """Sorted array of ordinals."""
+        self.flush()
+        return self._entries.ordinals
+
+    @property
+    def positions(self) -> array:
+        """Payload positions, in the order of the sorted ordinals."""
+        self.flush()
+        return self._entries.positions
+
+    def dates(self) -> Iterator[Date]:
+        """Iterate over the indexed dates in sorted order."""
+        for n in self.ordinals:
+            yield batch.date_from_ordinal(self.calendar, n)
+
+    # Queries
+
+    def _slice(self, start: int, stop: int) -> Tuple[int, int]:
+        self.flush()
+        ordinals = self._entries.ordinals
+        return (bisect_left(ordinals, start), bisect_left(ordinals, stop))
+
+    def _collect(self, ranges: Iterable[Tuple[int, int]]) -> array:
+        result = array('q')
+        for (start, stop) in ranges:
+            (i, j) = self._slice(start, stop)
+            result.extend(self._entries.positions[i:j])
+        return result
+
+    def _days_of_year(self, year: int, days: Iterable[int]) -> List[Tuple[int, int]]:
+        """Convert 0-up days of a year into half-open ordinal ranges (merging consecutive days)."""
+        tbl = batch.tables(self.calendar)
+        first = tbl.year_start[year - 1] + 1 - tbl.shift
+        ranges: List[Tuple[int, int]] = []
+        for k in days:
+            n = first + k
+            if ranges and (ranges[-1][1] == n):
+                ranges[-1] = (ranges[-1][0], n + 1)
+            else:
+                ranges.append((n, n + 1))
+        return ranges
+
+    def _years(self, start_year: int, end_year: Optional[int]) -> range:
+        tbl = batch.tables(self.calendar)
+        max_year = len(tbl.year_start) - 2
+        return range(max(1, start_year), min(max_year, start_year if (end_year is None) else end_year) + 1)
+
+    def between(self, start: DateOrOrdinal, stop: DateOrOrdinal) -> array:
+        """Positions of all dates in the half-open range [start, stop)."""
+        return self._collect([(_to_ordinal(start), _to_ordinal(stop))])
+
+    def count_between(self, start: DateOrOrdinal, stop: DateOrOrdinal) -> int:
+        """Number of dates in the half-open range [start, stop)."""
+        (i, j) = self._slice(_to_ordinal(start), _to_ordinal(stop))
+        return j - i
+
+    def year(self, year: int) -> array:
+        """Positions of all dates in a calendar year."""
+        periods = self._layout_for(year).periods
+        return self._collect(self._days_of_year(year, range(len(periods[is_leap_year(year)]))))
+
+    def period(self, year: int, period: int) -> array:
+        """Positions of all dates in a period (month or season) of a year."""
+        leap = is_leap_year(year)
+        periods = self._layout_for(year).periods[leap]
+        return self._collect(self._days_of_year(year, (k for (k, p) in enumerate(periods) if p == period)))
+
+    def week(self, year: int, period: int, week: int) -> array:
+        """Positions of all dates in a (1-up) week of a period (month or season) of a year.
+        Intercalary days do not belong to any week."""
+        leap = is_leap_year(year)
+        layout = self._layout_for(year)
+        days = (k for (k, (p, w)) in enumerate(zip(layout.periods[leap], layout.weeks[leap])) if (p, w) == (period, week))
+        return self._collect(self._days_of_year(year, days))
+
+    def day(self, year: int, period: int, day: int) -> array:
+        """Positions of all entries on a single day."""
+        n = self.calendar(year, period, day).toordinal()
+        return self._collect([(n, n + 1)])
+
+    def period_day(self, day: int, start_year: int, end_year: Optional[int] = None) -> array:
+        """Positions of all dates on the given day of any period (e.g. day 37, the mid-season day of the Seasonal calendar), over an inclusive range of years."""
+        ranges = []
+        for year in self._years(start_year, end_year):
+            days = self._layout_for(year).days[is_leap_year(year)]
+            ranges.extend(self._days_of_year(year, (k for (k, d) in enumerate(days) if d == day)))
+        return self._collect(ranges)
+
+    def intercalary(self, start_year: int, end_year: Optional[int] = None) -> array:
+        """Positions of all intercalary dates (days not belonging to any week, e.g. Leap Day and Year Day), over an inclusive range of years."""
+        ranges = []
+        for year in self._years(start_year, end_year):
+            ranges.extend(self._days_of_year(year, self._layout_for(year).intercalary[is_leap_year(year)]))
+        return self._collect(ranges)
+
+    def _layout_for(self, year: int) -> _YearLayout:
+        if not 1 <= year <= len(batch.tables(self.calendar).year_start) - 2:
+            raise ValueError(f'year out of range for {self.calendar.__name__}', year)
+        return _layout(self.calendar)
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}({self.calendar.__name__}, {len(self)} entries)'
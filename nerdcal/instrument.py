@@ -0,0 +1,180 @@
+"""Opt-in instrumentation of the core conversion entry points.
+
+When enabled, the methods listed in TARGETS are replaced on their classes by wrappers that count calls and accumulate wall-clock time (inclusive of nested calls, e.g. SeasonalDate.fromordinal includes Date.fromordinal).
+When disabled, the original methods are restored, so there is no overhead at all.
+
+Instrumentation can be enabled at import time by setting the environment variable NERDCAL_STATS=1, or at runtime with enable_stats() or the profile() context manager.
+
+Caches created with functools.lru_cache can be registered with register_cache, in which case their hit/miss counts are also reported by stats()."""
+
+from collections import namedtuple
+from contextlib import contextmanager
+from functools import wraps
+import os
+from threading import Lock
+from time import perf_counter
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+
+from nerdcal._base import Date, Datetime
+from nerdcal.ifc import IFCDate, IFCDatetime
+from nerdcal.positivist import PositivistDate
+from nerdcal.seasonal import SeasonalDate, SeasonalDatetime
+
+
+CallStats = namedtuple('CallStats', ['calls', 'seconds'])
+CacheStats = namedtuple('CacheStats', ['hits', 'misses'])
+
+# methods to instrument, as (class, attribute name)
+TARGETS: List[Tuple[type, str]] = [
+    (Date, 'fromtimestamp'),
+    (Date, 'fromordinal'),
+    (Date, 'fromdate'),
+    (Date, 'todate'),
+    (Datetime, 'fromtimestamp'),
+    (Datetime, 'fromdatetime'),
+    (Datetime, 'fromisoformat'),
+    (Datetime, 'todatetime'),
+    (IFCDate, '__post_init__'),
+    (IFCDate, '_from_year_and_ordinal'),
+    (IFCDate, 'fromisoformat'),
+    (IFCDate, 'toordinal'),
+    (IFCDate, 'weekday'),
+    (IFCDate, 'isoformat'),
+    (IFCDatetime, '__post_init__'),
+    (IFCDatetime, 'isoformat'),
+    (PositivistDate, 'weekday'),
+    (SeasonalDate, '__post_init__'),
+    (SeasonalDate, '_from_year_and_ordinal'),
+    (SeasonalDate, 'fromordinal'),
+    (SeasonalDate, 'fromisoformat'),
+    (SeasonalDate, 'toordinal'),
+    (SeasonalDate, 'weekday'),
+    (SeasonalDate, 'isoformat'),
+    (SeasonalDatetime, '__post_init__'),
+    (SeasonalDatetime, 'isoformat'),
+]
+
+_LOCK = Lock()
+# key -> [calls, seconds]
+_COUNTERS: Dict[str, List[Any]] = {f'{cls.__name__}.{name}': [0, 0.0] for (cls, name) in TARGETS}
+# key -> (cached function, (hits, misses) at last reset)
+_CACHES: Dict[str, Tuple[Any, Tuple[int, int]]] = {}
+# (class, name) -> original class attribute, while enabled
+_ORIGINALS: Dict[Tuple[type, str], Any] = {}
+# number of enable_stats calls not yet undone by disable_stats
+_ENABLE_COUNT = 0
+
+
+###########
+# HELPERS #
+###########
+
+def _wrap(key: str, func: Callable) -> Callable:
+    counter = _COUNTERS[key]
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        start = perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            elapsed = perf_counter() - start
+            with _LOCK:
+                counter[0] += 1
+                counter[1] += elapsed
+    return wrapper
+
+
+#######
+# API #
+#######
+
+def is_enabled() -> bool:
+    """Return True if instrumentation is currently enabled."""
+    return bool(_ORIGINALS)
+
+def enable_stats() -> None:
+    """Install the instrumented versions of the target methods.
+
+    Calls are reference-counted: instrumentation stays enabled until disable_stats has been called as many times as enable_stats (so nested or concurrent profile blocks do not switch it off for each other)."""
+    global _ENABLE_COUNT
+    with _LOCK:
+        _ENABLE_COUNT += 1
+        if _ORIGINALS:
+            return
+        for (cls, name) in TARGETS:
+            orig = cls.__dict__[name]
+            key = f'{cls.__name__}.{name}'
+            if isinstance(orig, classmethod):
+                wrapped = classmethod(_wrap(key, orig.__func__))
+            else:
+                wrapped = _wrap(key, orig)
+            _ORIGINALS[(cls, name)] = orig
+            setattr(cls, name, wrapped)
+
+def disable_stats() -> None:
+    """Undo one call to enable_stats, restoring the original (uninstrumented) methods once every call has been undone. Accumulated statistics are kept."""
+    global _ENABLE_COUNT
+    with _LOCK:
+        _ENABLE_COUNT = max(0, _ENABLE_COUNT - 1)
+        if _ENABLE_COUNT:
+            return
+        for ((cls, name), orig) in _ORIGINALS.items():
+            setattr(cls, name, orig)
+        _ORIGINALS.clear()
+
+def register_cache(name: str, func: Any) -> None:
+    """Register a function decorated with functools.lru_cache, so that its hit/miss counts are reported by stats()."""
+    info = func.cache_info()
+    _CACHES[name] = (func, (info.hits, info.misses))
+
+def stats() -> Dict[str, Dict[str, Any]]:
+    """Return a snapshot of the statistics collected since the last reset.
+
+    The result has two entries:
+        'calls': maps 'Class.method' to CallStats(calls, seconds), for methods that have been called
+        'caches': maps registered cache names to CacheStats(hits, misses)"""
+    with _LOCK:
+        calls = {key: CallStats(*counter) for (key, counter) in _COUNTERS.items() if counter[0]}
+    caches = {}
+    for (name, (func, (hits, misses))) in _CACHES.items():
+        info = func.cache_info()
+        caches[name] = CacheStats(info.hits - hits, info.misses - misses)
+    return {'calls': calls, 'caches': caches}
+
+def reset_stats() -> None:
+    """Reset all statistics to zero."""
+    with _LOCK:
+        for counter in _COUNTERS.values():
+            counter[0] = 0
+            counter[1] = 0.0
+    for name in list(_CACHES):
+        register_cache(name, _CACHES[name][0])
+
+@contextmanager
+def profile() -> Iterator[Dict[str, Dict[str, Any]]]:
+    """Context manager enabling instrumentation for the duration of a block.
+
+    Yields a dict which, on exit, is filled in with the statistics (in the format of stats()) collected within the block.
+    Statistics collected outside the block are unaffected, and the previous enabled state is restored on exit."""
+    result: Dict[str, Dict[str, Any]] = {}
+    before = stats()
+    enable_stats()
+    try:
+        yield result
+    finally:
+        disable_stats()
+        after = stats()
+        calls = {}
+        for (key, (n, seconds)) in after['calls'].items():
+            (n0, seconds0) = before['calls'].get(key, (0, 0.0))
+            if n > n0:
+                calls[key] = CallStats(n - n0, seconds - seconds0)
+        caches = {}
+        for (name, (hits, misses)) in after['caches'].items():
+            (hits0, misses0) = before['caches'].get(name, (0, 0))
+            caches[name] = CacheStats(hits - hits0, misses - misses0)
+        result.update(calls = calls, caches = caches)
+
+
+if os.environ.get('NERDCAL_STATS', '') not in ('', '0'):
+    enable_stats()
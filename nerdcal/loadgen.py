@@ -0,0 +1,102 @@
+"""Load generator for the local conversion service (see nerdcal.server).
+
+Run with: python -m nerdcal loadgen [--host HOST] [--port PORT] [-c CONNECTIONS] [-n REQUESTS] [--batch-size N] [--grid-fraction F]
+
+Opens a number of keep-alive connections, each of which sends requests one after another, and reports throughput and latency percentiles.
+Requests convert random ordinals (GET, or POST batches if --batch-size > 1), with a fraction of them asking for calendar grids instead."""
+
+import asyncio
+import json
+import random
+import time
+from typing import Dict, List, Tuple
+
+from nerdcal.batch import CALENDARS
+from nerdcal.server import DEFAULT_HOST, DEFAULT_PORT
+
+# range of ordinals to convert (roughly 1900..2100, so that the server's caches get some hits)
+ORDINAL_RANGE = (693596, 766645)
+
+
+async def _request(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, method: str, target: str, body: bytes = b'') -> Tuple[int, bytes]:
+    """Send a request on a keep-alive connection and read its response, returning (status, body)."""
+    head = f'{method} {target} HTTP/1.1\r\nHost: localhost\r\nContent-Length: {len(body)}\r\n\r\n'
+    writer.write(head.encode('ascii') + body)
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionError('server closed the connection')
+    status = int(status_line.split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b''):
+            break
+        (key, _, value) = line.decode('latin-1').partition(':')
+        if key.strip().lower() == 'content-length':
+            length = int(value)
+    return (status, await reader.readexactly(length))
+
+def _random_request(rng: random.Random, batch_size: int, grid_fraction: float) -> Tuple[str, str, bytes]:
+    if rng.random() < grid_fraction:
+        calendar = rng.choice(list(CALENDARS))
+        period = rng.randint(1, 5 if (calendar == 'seasonal') else 13)
+        return ('GET', f'/calendar/{calendar}/{rng.randint(1900, 2100)}/{period}', b'')
+    if batch_size > 1:
+        queries = [{'ordinal': rng.randint(*ORDINAL_RANGE)} for _ in range(batch_size)]
+        return ('POST', '/convert', json.dumps(queries).encode('utf-8'))
+    return ('GET', f'/convert?ordinal={rng.randint(*ORDINAL_RANGE)}', b'')
+
+async def _worker(host: str, port: int, num_requests: int, batch_size: int, grid_fraction: float, seed: int, latencies: List[float], conversions: List[int], errors: Dict[int, int]) -> None:
+    rng = random.Random(seed)
+    (reader, writer) = await asyncio.open_connection(host, port)
+    try:
+        for _ in range(num_requests):
+            (method, target, body) = _random_request(rng, batch_size, grid_fraction)
+            start = time.perf_counter()
+            (status, _) = await _request(reader, writer, method, target, body)
+            latencies.append(time.perf_counter() - start)
+            # a grid request counts as a single conversion
+            conversions.append(batch_size if (method == 'POST') else 1)
+            if status != 200:
+                errors[status] = errors.get(status, 0) + 1
+    finally:
+        writer.close()
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    """Return the q-th percentile (0 <= q <= 100) of a sorted list, by the nearest-rank method."""
+    if not sorted_values:
+        return float('nan')
+    rank = max(1, int(round(q / 100 * len(sorted_values))))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+async def run(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, connections: int = 16, num_requests: int = 10000, batch_size: int = 1, grid_fraction: float = 0.05, seed: int = 0) -> Dict[str, float]:
+    """Send num_requests requests split across the given number of connections, returning summary statistics:
+    requests, conversions, errors, seconds, requests_per_second, conversions_per_second, and latency percentiles p50, p90, p99, max (in milliseconds)."""
+    latencies: List[float] = []
+    conversions: List[int] = []
+    errors: Dict[int, int] = {}
+    counts = [num_requests // connections + (1 if (i < num_requests % connections) else 0) for i in range(connections)]
+    start = time.perf_counter()
+    await asyncio.gather(*(_worker(host, port, count, batch_size, grid_fraction, seed + i, latencies, conversions, errors) for (i, count) in enumerate(counts) if count))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    summary = {
+        'requests': len(latencies),
+        'conversions': sum(conversions),
+        'errors': sum(errors.values()),
+        'seconds': elapsed,
+        'requests_per_second': len(latencies) / elapsed,
+        'conversions_per_second': sum(conversions) / elapsed,
+    }
+    for q in (50, 90, 99):
+        summary[f'p{q}'] = 1000 * percentile(latencies, q)
+    summary['max'] = 1000 * latencies[-1] if latencies else float('nan')
+    return summary
+
+def report(summary: Dict[str, float]) -> str:
+    """Format the summary returned by run."""
+    return '\n'.join([
+        f"{summary['requests']} requests ({summary['conversions']} conversions, {summary['errors']} errors) in {summary['seconds']:.2f} s",
+        f"throughput: {summary['requests_per_second']:,.0f} requests/s, {summary['conversions_per_second']:,.0f} conversions/s",
+        f"latency (ms): p50 {summary['p50']:.3f}, p90 {summary['p90']:.3f}, p99 {summary['p99']:.3f}, max {summary['max']:.3f}",
+    ])
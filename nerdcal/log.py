@@ -0,0 +1,69 @@
+"""Logging formatter which stamps records in calendar time.
+
+CalendarFormatter renders %(asctime)s with a nerdcal Datetime class's strftime, so the calendar-aware directives (%Y, %m, %d, %B, %A, etc.; see Date.strftime) are supported in datefmt.
+
+Rendering a timestamp in another calendar involves several object constructions, so the formatter caches the rendered date/time for the current second, and only renders the sub-second part (%f in datefmt, or the milliseconds appended by default) for each record.
+The cache is a single tuple which is replaced (never mutated), so the formatter is safe to share between threads.
+
+Example:
+
+    handler.setFormatter(CalendarFormatter('%(asctime)s %(levelname)s %(message)s', datefmt = '%Y-%m-%d %H:%M:%S.%f', calendar = SeasonalDatetime))"""
+
+from datetime import datetime, timezone
+import logging
+import math
+import re
+import time
+from typing import Any, List, Optional, Tuple, Type
+
+from nerdcal._base import Datetime
+from nerdcal.ifc import IFCDatetime
+
+# placeholder for %f, which passes through strftime unchanged
+_SUBSECOND = '\x00'
+
+
+class CalendarFormatter(logging.Formatter):
+    """logging.Formatter rendering record times in the calendar of a nerdcal Datetime class (IFCDatetime by default).
+
+    Times are local, unless utc is True (or the converter attribute is set to time.gmtime, as with logging.Formatter).
+    If datefmt is None, the default_time_format and default_msec_format attributes are used, as with logging.Formatter.
+    Raises a ValueError if datefmt contains a directive unsupported by the calendar's strftime (see Date.strftime)."""
+
+    def __init__(self, fmt: Optional[str] = None, datefmt: Optional[str] = None, style: str = '%', calendar: Type[Datetime] = IFCDatetime, utc: bool = False, **kwargs: Any) -> None:
+        super().__init__(fmt, datefmt, style, **kwargs)
+        self.calendar = calendar
+        self.utc = utc
+        # (second, datefmt, rendered parts of the time string, split at the sub-second fields)
+        self._cache: Optional[Tuple[int, Optional[str], List[str]]] = None
+        if datefmt is not None:
+            # fail here rather than on every record
+            self._render(0, datefmt)
+
+    def _render(self, second: int, datefmt: Optional[str]) -> List[str]:
+        """Render the time string for a whole second, split at the positions of the sub-second fields."""
+        if (self.utc) or (self.converter is time.gmtime):
+            dt = datetime.fromtimestamp(second, timezone.utc)
+        else:
+            dt = datetime.fromtimestamp(second).astimezone()
+        fmt = self.default_time_format if (datefmt is None) else datefmt
+        # replace %f (but not %%f) by a placeholder
+        fmt = re.sub('%(.)', lambda match: _SUBSECOND if (match.group(1) == 'f') else match.group(0), fmt, flags = re.DOTALL)
+        return self.calendar.fromdatetime(dt).strftime(fmt).split(_SUBSECOND)
+
+    def formatTime(self, record: logging.LogRecord, datefmt: Optional[str] = None) -> str:
+        second = math.floor(record.created)
+        cache = self._cache
+        if (cache is None) or (cache[0] != second) or (cache[1] != datefmt):
+            cache = (second, datefmt, self._render(second, datefmt))
+            self._cache = cache
+        parts = cache[2]
+        if datefmt is None:
+            s = parts[0]
+            if self.default_msec_format:
+                s = self.default_msec_format % (s, record.msecs)
+            return s
+        if len(parts) == 1:
+            return parts[0]
+        microsecond = '%06d' % min(999999, int((record.created - second) * 1000000))
+        return microsecond.join(parts)
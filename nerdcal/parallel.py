@@ -0,0 +1,306 @@
+"""Parallel batch conversion across CPU cores.
+
+Large input arrays are split into contiguous shards, each of which is processed by one of the kernels in nerdcal.batch.
+On standard CPython, shards run in a process pool: the input and output arrays live in shared memory (multiprocessing.shared_memory), so only the shared memory block names and shard bounds are sent to the workers, and each worker writes its results directly into place. ISO strings are passed as fixed-width ASCII bytes.
+Ordinary arrays are copied into temporary shared memory blocks (and the outputs copied back) on each call. For very large inputs, allocate the buffers with Pool.shared_array instead, and pass the outputs via the out argument: the workers then read and write them in place, with no copies at all.
+On free-threaded CPython (GIL disabled), a thread pool operating directly on the arrays is used instead.
+Where shared memory is unavailable (Python 3.7), each shard's slices of the buffers are pickled to the worker processes, and the results pickled back.
+
+The calendar lookup tables are built once per worker, by the pool initializer.
+
+A Pool can be reused across many calls; the module-level functions create a temporary Pool for a single call.
+
+Example:
+
+    with Pool(workers = 8, calendars = [IFCDate]) as pool:
+        (years, months, days) = pool.to_fields(IFCDate, ordinals)
+        # without copies
+        with pool.shared_array('q', n) as ordinals, pool.shared_array('b', n) as weekdays:
+            ...  # fill in ordinals
+            pool.weekdays(IFCDate, ordinals, out = weekdays)"""
+
+from array import array
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import ExitStack
+import os
+import sys
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Sequence, Tuple, Type
+
+from nerdcal import batch
+from nerdcal._base import Date
+
+try:
+    from multiprocessing.shared_memory import SharedMemory
+except ImportError:  # Python < 3.8
+    SharedMemory = None
+
+# minimum number of values per shard, below which the parallelism is not worthwhile
+MIN_SHARD_SIZE = 10000
+
+
+###########
+# HELPERS #
+###########
+
+def gil_enabled() -> bool:
+    """Return False if running on free-threaded CPython with the GIL disabled."""
+    return getattr(sys, '_is_gil_enabled', lambda: True)()
+
+def _init_worker(calendars: Iterable[Type[Date]]) -> None:
+    """Pool initializer: build the lookup tables for each calendar once per worker."""
+    for cls in calendars:
+        batch.tables(cls)
+
+# kernel name -> (function, number of leading Date class arguments, formats of the shared buffers)
+_KERNELS = {
+    'fields': (batch.fields_into, 1, ('q', 'q', 'q', 'q')),
+    'weekdays': (batch.weekdays_into, 1, ('q', 'b')),
+    'isoformat': (batch.isoformat_into, 1, ('q', 'B')),
+    'fromisoformat': (batch.fromisoformat_into, 1, ('B', 'q')),
+    'timestamps': (batch.timestamps_into, 0, ('d', 'q', 'q')),
+}
+
+def _run_shm_shard(kernel: str, cls: Optional[Type[Date]], names: Sequence[str], start: int, stop: int) -> None:
+    """Run a kernel over a shard in a worker process, attaching to the shared memory blocks by name."""
+    (func, nargs, formats) = _KERNELS[kernel]
+    with ExitStack() as stack:
+        views = []
+        for (name, fmt) in zip(names, formats):
+            shm = SharedMemory(name = name)
+            stack.callback(shm.close)
+            view = shm.buf.cast(fmt)
+            stack.callback(view.release)
+            views.append(view)
+        func(*([cls] if nargs else []), *views, start, stop)
+
+class SharedArray:
+    """Fixed-length array of a given array typecode, backed by a shared memory block.
+
+    Supports len, indexing and slicing like a memoryview (the view attribute). The block is freed by close (or on exiting a with block), after which the array must not be used."""
+
+    def __init__(self, typecode: str, n: int) -> None:
+        if SharedMemory is None:
+            raise RuntimeError('shared memory requires Python 3.8+')
+        self.typecode = typecode
+        nbytes = n * array(typecode).itemsize
+        self.shm = SharedMemory(create = True, size = max(1, nbytes))
+        self.view = self.shm.buf[:nbytes].cast(typecode)
+
+    @property
+    def name(self) -> str:
+        """Name of the shared memory block."""
+        return self.shm.name
+
+    def __len__(self) -> int:
+        return len(self.view)
+
+    def __getitem__(self, key: Any) -> Any:
+        return self.view[key]
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        self.view[key] = value
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self.view)
+
+    def tolist(self) -> List[Any]:
+        return self.view.tolist()
+
+    def close(self) -> None:
+        """Release and free the shared memory block."""
+        if self.view is not None:
+            self.view.release()
+            self.view = None
+            self.shm.close()
+            self.shm.unlink()
+
+    def __enter__(self) -> 'SharedArray':
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+def _run_pickled_shard(kernel: str, cls: Optional[Type[Date]], buffers: List[Any], n: int) -> List[Any]:
+    """Run a kernel over a shard of n values passed by value (slices of the input and output buffers), returning the output buffers."""
+    (func, nargs, _) = _KERNELS[kernel]
+    func(*([cls] if nargs else []), *buffers, 0, n)
+    return buffers[1:]
+
+
+########
+# POOL #
+########
+
+class Pool:
+    """Pool of workers for batch conversion.
+
+    workers: number of workers (defaults to os.cpu_count())
+    calendars: Date classes whose lookup tables should be built in each worker up front
+    threads: whether to use threads rather than processes (defaults to True only if the GIL is disabled)
+
+    With a single worker, everything runs in the calling thread."""
+
+    def __init__(self, workers: Optional[int] = None, calendars: Iterable[Type[Date]] = (), threads: Optional[bool] = None) -> None:
+        self.workers = workers or os.cpu_count() or 1
+        self.calendars = tuple(calendars)
+        self.threads = (not gil_enabled()) if (threads is None) else threads
+        self._executor: Optional[Executor] = None
+
+    def _get_executor(self) -> Optional[Executor]:
+        if (self.workers > 1) and (self._executor is None):
+            if self.threads:
+                _init_worker(self.calendars)
+                self._executor = ThreadPoolExecutor(self.workers)
+            else:
+                self._executor = ProcessPoolExecutor(self.workers, initializer = _init_worker, initargs = (self.calendars,))
+        return self._executor
+
+    def close(self) -> None:
+        """Shut down the workers."""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def __enter__(self) -> 'Pool':
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def shared_array(self, typecode: str, n: int) -> SharedArray:
+        """Allocate a zero-filled array of n values in shared memory, which the workers can read and write in place.
+        Pass such arrays as the inputs and out arguments of the conversion methods to avoid copying; the caller is responsible for closing them."""
+        return SharedArray(typecode, n)
+
+    def _shards(self, n: int) -> List[Tuple[int, int]]:
+        num_shards = max(1, min(self.workers, n // MIN_SHARD_SIZE))
+        bounds = [n * i // num_shards for i in range(num_shards + 1)]
+        return list(zip(bounds[:-1], bounds[1:]))
+
+    def _run(self, kernel: str, cls: Optional[Type[Date]], n: int, buffers: List[Any]) -> None:
+        """Run a kernel over n values, sharded across the workers.
+        buffers are the kernel's input buffer followed by its output buffers (arrays, bytearrays, or SharedArrays), in the order of _KERNELS[kernel][2]; outputs are written in place."""
+        (func, nargs, formats) = _KERNELS[kernel]
+        for (buf, fmt) in zip(buffers, formats):
+            if isinstance(buf, SharedArray) and (buf.typecode != fmt):
+                raise ValueError(f'expected a SharedArray of typecode {fmt!r} (got {buf.typecode!r})')
+        shards = self._shards(n)
+        executor = self._get_executor() if (len(shards) > 1) else None
+        cls_args = [cls] if nargs else []
+        # (the kernels index the memoryviews of SharedArrays directly)
+        views = [buf.view if isinstance(buf, SharedArray) else buf for buf in buffers]
+        if executor is None:
+            func(*cls_args, *views, 0, n)
+            return
+        if self.threads:
+            futures = [executor.submit(func, *cls_args, *views, start, stop) for (start, stop) in shards]
+            for future in futures:
+                future.result()
+            return
+        if SharedMemory is None:
+            # elements per value in each buffer (ISO strings take ISO_WIDTH bytes each)
+            widths = [len(buf) // n for buf in buffers]
+            futures = [executor.submit(_run_pickled_shard, kernel, cls, [buf[start * w:stop * w] for (buf, w) in zip(buffers, widths)], stop - start) for (start, stop) in shards]
+            for ((start, stop), future) in zip(shards, futures):
+                for (buf, w, out) in zip(buffers[1:], widths[1:], future.result()):
+                    buf[start * w:stop * w] = out
+            return
+        with ExitStack() as stack:
+            # SharedArrays are used in place; other buffers are copied to temporary blocks
+            temporary = []
+            for (i, buf) in enumerate(buffers):
+                if not isinstance(buf, SharedArray):
+                    tmp = stack.enter_context(SharedArray(formats[i], len(buf)))
+                    if i == 0:
+                        tmp[:] = memoryview(buf).cast('B').cast(formats[i])
+                    temporary.append((buf, tmp))
+                    buf = tmp
+                buffers[i] = buf
+            names = [buf.name for buf in buffers]
+            futures = [executor.submit(_run_shm_shard, kernel, cls, names, start, stop) for (start, stop) in shards]
+            for future in futures:
+                future.result()
+            # copy the outputs back in place (the input needs no copying)
+            for (buf, tmp) in temporary:
+                if tmp is not buffers[0]:
+                    memoryview(buf).cast('B').cast(tmp.typecode)[:] = tmp.view
+
+    # Conversions
+    # (Each accepts an optional out argument: preallocated output buffers, e.g. from shared_array, which are filled in and returned.)
+
+    def to_fields(self, cls: Type[Date], ordinals: Sequence[int], out: Optional[Tuple[Any, Any, Any]] = None) -> Tuple[Any, Any, Any]:
+        """Convert a sequence of ordinals to (years, periods, days) arrays."""
+        ordinals = _as_array('q', ordinals)
+        out = _outputs(out, 3, lambda: array('q', bytes(8 * len(ordinals))), len(ordinals))
+        self._run('fields', cls, len(ordinals), [ordinals, *out])
+        return tuple(out)
+
+    def weekdays(self, cls: Type[Date], ordinals: Sequence[int], out: Any = None) -> Any:
+        """Compute the weekday() of each date in a sequence of ordinals."""
+        ordinals = _as_array('q', ordinals)
+        (out,) = _outputs(None if (out is None) else (out,), 1, lambda: array('b', bytes(len(ordinals))), len(ordinals))
+        self._run('weekdays', cls, len(ordinals), [ordinals, out])
+        return out
+
+    def isoformat(self, cls: Type[Date], ordinals: Sequence[int], out: Any = None) -> Any:
+        """Render a sequence of ordinals as ISO strings.
+        If out is given (a byte buffer of ISO_WIDTH bytes per value), the strings are written to it as ASCII, and it is returned instead of a list."""
+        ordinals = _as_array('q', ordinals)
+        if out is None:
+            data = bytearray(batch.ISO_WIDTH * len(ordinals))
+            self._run('isoformat', cls, len(ordinals), [ordinals, data])
+            return batch.split_iso(data)
+        _outputs((out,), 1, None, batch.ISO_WIDTH * len(ordinals))
+        self._run('isoformat', cls, len(ordinals), [ordinals, out])
+        return out
+
+    def fromisoformat(self, cls: Type[Date], strings: Sequence[str], out: Any = None) -> Any:
+        """Parse a sequence of ISO strings into an array of ordinals.
+        The strings may also be given as a SharedArray of ASCII bytes (ISO_WIDTH per value)."""
+        if isinstance(strings, SharedArray):
+            (data, n) = (strings, len(strings) // batch.ISO_WIDTH)
+        else:
+            (data, n) = (bytearray(batch.join_iso(strings)), len(strings))
+        (out,) = _outputs(None if (out is None) else (out,), 1, lambda: array('q', bytes(8 * n)), n)
+        self._run('fromisoformat', cls, n, [data, out])
+        return out
+
+    def from_timestamps(self, timestamps: Sequence[float], out: Optional[Tuple[Any, Any]] = None) -> Tuple[Any, Any]:
+        """Split a sequence of POSIX timestamps (in UTC) into (ordinals, microseconds of the day) arrays."""
+        timestamps = _as_array('d', timestamps)
+        out = _outputs(out, 2, lambda: array('q', bytes(8 * len(timestamps))), len(timestamps))
+        self._run('timestamps', None, len(timestamps), [timestamps, *out])
+        return tuple(out)
+
+def _as_array(typecode: str, values: Sequence[Any]) -> Any:
+    if isinstance(values, (array, SharedArray)) and (values.typecode == typecode):
+        return values
+    return array(typecode, values)
+
+def _outputs(out: Optional[Sequence[Any]], count: int, make: Optional[Callable[[], Any]], n: int) -> List[Any]:
+    """Check the given output buffers (each of length n), or make new ones."""
+    if out is None:
+        return [make() for _ in range(count)]
+    if (len(out) != count) or any(len(buf) != n for buf in out):
+        raise ValueError(f'out must be {count} buffer(s) of length {n}')
+    return list(out)
+
+
+##############
+# SHORTHANDS #
+##############
+
+def _with_pool(method: str) -> Callable:
+    def func(*args: Any, workers: Optional[int] = None, **kwargs: Any) -> Any:
+        calendars = [arg for arg in args[:1] if isinstance(arg, type)]
+        with Pool(workers = workers, calendars = calendars) as pool:
+            return getattr(pool, method)(*args, **kwargs)
+    func.__name__ = method
+    func.__doc__ = getattr(Pool, method).__doc__[:-1] + ', using a temporary Pool with the given number of workers.'
+    return func
+
+to_fields = _with_pool('to_fields')
+weekdays = _with_pool('weekdays')
+isoformat = _with_pool('isoformat')
+fromisoformat = _with_pool('fromisoformat')
+from_timestamps = _with_pool('from_timestamps')
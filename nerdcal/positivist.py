@@ -4,7 +4,7 @@ Devised by the philosopher Auguste Comte in 1849.
 
 See: https://en.wikipedia.org/wiki/Positivist_calendar"""
 
-from typing import List
+from typing import Dict, List
 
 from nerdcal._base import days_before_year, is_leap_year
 from nerdcal.ifc import DAYS_IN_MONTH, DAYS_IN_WEEK, MIN_MONTH, MAX_MONTH, IFCDate, IFCDatetime
@@ -44,6 +44,10 @@ class PositivistDate(IFCDate):
     def weekday_abbrevs(cls) -> List[str]:
         return ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']
 
+    @classmethod
+    def intercalary_names(cls) -> Dict[int, str]:
+        return {7: 'Festival of the Dead', 8: 'Festival of Holy Women'}
+
     # Computations
 
     def weekday(self) -> int:
@@ -9,7 +9,7 @@ from dataclasses import dataclass
 from datetime import time, timedelta, tzinfo
 from itertools import accumulate
 from operator import add
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 
 from nerdcal._base import check_int, Date, Datetime, days_before_year, is_leap_year, parse_isoformat_date
 
@@ -31,6 +31,8 @@ class SeasonalDate(Date):
     Each month is divided into four weeks of 9 days each, named after the planets.
     The leap year occurs in the usual place (old Feb. 29), which is between Winter 70 and 71.
     For ease of representation, the leap day will be designated Winter 0."""
+    _pickle_fields = ('year', 'season', 'day')
+
     year: int
     season: int
     day: int
@@ -54,6 +56,9 @@ class SeasonalDate(Date):
     def get_year(self) -> int:
         return self.year
 
+    def _period_and_day(self) -> Tuple[int, int]:
+        return (self.season, self.day)
+
     # Helpers
 
     @classmethod
@@ -84,6 +89,18 @@ class SeasonalDate(Date):
     def weekday_abbrevs(cls) -> List[str]:
         return ['Mer', 'Ven', 'Ear', 'Mar', 'Jup', 'Sat', 'Ura', 'Nep', 'Plu']
 
+    @classmethod
+    def intercalary_names(cls) -> Dict[int, str]:
+        return {9: 'Mid-Season Day', 10: 'Leap Day'}
+
+    @classmethod
+    def _period_names(cls) -> List[str]:
+        return cls.season_names()
+
+    @classmethod
+    def _period_abbrevs(cls) -> List[str]:
+        return cls.season_abbrevs()
+
     # Additional constructors
 
     @classmethod
@@ -91,7 +108,7 @@ class SeasonalDate(Date):
         dbs = cls._days_before_season(year)
         season = bisect(dbs, n)
         day = n - dbs[season - 1]
-        if (season == 1):
+        if (season == 1) and is_leap_year(year):
             if (day == 70):
                 day = -1
             elif (day > 70):
@@ -133,9 +150,10 @@ class SeasonalDate(Date):
             return 10
         if (self.day == MIDSEASON_DAY):
             return 9
+        # each month (the days before and after mid-season) starts on the first day of the week
         if (self.day > MIDSEASON_DAY):
-            return (self.day - 1) % 9
-        return self.day % 9
+            return (self.day - MIDSEASON_DAY - 1) % 9
+        return (self.day - 1) % 9
 
     # Conversions to string
 
@@ -147,10 +165,6 @@ class SeasonalDate(Date):
         season_name = self.season_abbrevs()[self.season - 1]
         return '{} {} {:2d}'.format(weekday_name, season_name, self.day)
 
-    def strftime(self, fmt: str) -> str:
-        # TODO: revamp strftime to handle season/day numbers/names
-        raise NotImplementedError
-
     def isoformat(self) -> str:
         return f'{self.year:04d}-{self.season:02d}-{self.day:02d}'
 
@@ -0,0 +1,250 @@
+"""Compact serialization of nerdcal values.
+
+Pickle: Date and Datetime pickle as (class, ordinal[, microsecond of the day[, tzinfo]]), via restore functions in nerdcal.batch, which rebuild the fields from its lookup tables rather than re-running validation.
+
+JSON and msgpack: values are encoded by calendar class name (or index) plus ordinal and microsecond of the day. Lists/tuples of values of a single class (with a single tzinfo) are encoded as packed arrays rather than one object per value:
+
+    JSON:     {"__nerdcal__": "IFCDate", "ordinals": [...]}
+    msgpack:  an ExtType whose payload is a small header followed by little-endian int64 arrays
+
+Only datetime.timezone (fixed-offset) tzinfos can be encoded to JSON or msgpack, and their names are not preserved.
+
+msgpack is an optional dependency, only imported when used. packb and unpackb are shorthands for:
+
+    msgpack.packb(pack(obj), default = msgpack_default)
+    msgpack.unpackb(data, ext_hook = msgpack_ext_hook)"""
+
+from array import array
+from dataclasses import dataclass
+from datetime import timedelta, timezone, tzinfo
+import json
+import struct
+import sys
+from typing import Any, Dict, List, Optional, Sequence
+
+from nerdcal import batch
+from nerdcal._base import Date, Datetime, microsecond_of_day
+from nerdcal.ifc import IFCDate, IFCDatetime
+from nerdcal.positivist import PositivistDate, PositivistDatetime
+from nerdcal.seasonal import SeasonalDate, SeasonalDatetime
+
+# the index of each class is its tag in msgpack payloads, so new classes must be appended
+CLASSES = [IFCDate, IFCDatetime, PositivistDate, PositivistDatetime, SeasonalDate, SeasonalDatetime]
+CLASSES_BY_NAME = {cls.__name__: cls for cls in CLASSES}
+CLASS_INDEX = {cls: i for (i, cls) in enumerate(CLASSES)}
+
+TAG_KEY = '__nerdcal__'
+EXT_VALUE = 64   # msgpack extension type code for a single value
+EXT_PACKED = 65  # msgpack extension type code for a packed array of values
+
+# flags in the header of a packed msgpack array
+_HAS_MICROSECONDS = 1
+_HAS_TZINFO = 2
+
+
+###########
+# HELPERS #
+###########
+
+def _class_for_name(name: str) -> type:
+    try:
+        return CLASSES_BY_NAME[name]
+    except KeyError:
+        raise ValueError(f'unknown nerdcal class: {name!r}') from None
+
+def _class_index(cls: type) -> int:
+    try:
+        return CLASS_INDEX[cls]
+    except KeyError:
+        raise TypeError(f'cannot serialize values of type {cls.__name__}') from None
+
+def _utcoffset_us(tz: tzinfo) -> int:
+    """Get the offset of a fixed-offset timezone, in microseconds."""
+    if not isinstance(tz, timezone):
+        raise TypeError(f'only datetime.timezone tzinfos can be serialized (got type {type(tz).__name__})')
+    return tz.utcoffset(None) // timedelta(microseconds = 1)
+
+def _timezone(offset_us: int) -> timezone:
+    return timezone(timedelta(microseconds = offset_us))
+
+def _int64_bytes(values: array) -> bytes:
+    if sys.byteorder == 'big':
+        values = array('q', values)
+        values.byteswap()
+    return values.tobytes()
+
+def _int64_array(data: bytes) -> array:
+    values = array('q', data)
+    if sys.byteorder == 'big':
+        values.byteswap()
+    return values
+
+
+###########
+# PACKING #
+###########
+
+@dataclass(frozen = True)
+class PackedValues:
+    """A sequence of nerdcal values of a single class, stored as arrays.
+    (This is deliberately not a tuple, so that encoders pass it to their default hooks.)"""
+    cls: type
+    ordinals: array
+    # microsecond of the day (Datetimes only)
+    microseconds: Optional[array] = None
+    tzinfo: Optional[tzinfo] = None
+
+    @classmethod
+    def from_values(cls, values: Sequence[Any]) -> Optional['PackedValues']:
+        """Pack a sequence of values, if they are all Dates of the same class, or all Datetimes of the same class and tzinfo.
+        Otherwise, return None."""
+        if not values:
+            return None
+        value_cls = type(values[0])
+        if (value_cls not in CLASS_INDEX) or any(type(value) is not value_cls for value in values):
+            return None
+        if issubclass(value_cls, Date):
+            return cls(value_cls, array('q', [value.toordinal() for value in values]))
+        tz = values[0].timetz().tzinfo
+        times = [value.timetz() for value in values]
+        if any(t.tzinfo is not tz for t in times):
+            return None
+        ordinals = array('q', [value.date().toordinal() for value in values])
+        return cls(value_cls, ordinals, array('q', [microsecond_of_day(t) for t in times]), tz)
+
+    def unpack(self) -> List[Any]:
+        """Convert back to a list of values."""
+        if self.microseconds is None:
+            return [batch.date_from_ordinal(self.cls, n) for n in self.ordinals]
+        return [batch.datetime_from_ordinal(self.cls, n, us, self.tzinfo) for (n, us) in zip(self.ordinals, self.microseconds)]
+
+def pack(obj: Any) -> Any:
+    """Recursively replace homogeneous lists/tuples of nerdcal values within dicts, lists, and tuples by PackedValues.
+    Named tuples are rebuilt with their own class; other subclasses of list/tuple become plain lists (which is how the encoders treat them anyway)."""
+    if isinstance(obj, dict):
+        return {key: pack(value) for (key, value) in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        packed = PackedValues.from_values(obj)
+        if packed is not None:
+            return packed
+        items = [pack(value) for value in obj]
+        if type(obj) is tuple:
+            return tuple(items)
+        if isinstance(obj, tuple) and hasattr(obj, '_make'):
+            return obj._make(items)
+        return items
+    return obj
+
+
+########
+# JSON #
+########
+
+class JSONEncoder(json.JSONEncoder):
+    """JSON encoder for nerdcal values, packing homogeneous lists of values into arrays."""
+
+    def default(self, o: Any) -> Any:
+        if isinstance(o, PackedValues):
+            d = {TAG_KEY: o.cls.__name__, 'ordinals': o.ordinals.tolist()}
+            if o.microseconds is not None:
+                d['microseconds'] = o.microseconds.tolist()
+            if o.tzinfo is not None:
+                d['utcoffset'] = _utcoffset_us(o.tzinfo)
+            return d
+        if isinstance(o, Date):
+            _class_index(type(o))
+            return {TAG_KEY: type(o).__name__, 'ordinal': o.toordinal()}
+        if isinstance(o, Datetime):
+            _class_index(type(o))
+            t = o.timetz()
+            d = {TAG_KEY: type(o).__name__, 'ordinal': o.date().toordinal(), 'microsecond': microsecond_of_day(t)}
+            if t.tzinfo is not None:
+                d['utcoffset'] = _utcoffset_us(t.tzinfo)
+            return d
+        return super().default(o)
+
+    def iterencode(self, o: Any, _one_shot: bool = False) -> Any:
+        return super().iterencode(pack(o), _one_shot)
+
+def json_object_hook(d: Dict[str, Any]) -> Any:
+    """object_hook for json.load(s), decoding nerdcal values (and arrays of them)."""
+    name = d.get(TAG_KEY)
+    if name is None:
+        return d
+    cls = _class_for_name(name)
+    tz = _timezone(d['utcoffset']) if ('utcoffset' in d) else None
+    if 'ordinals' in d:
+        microseconds = array('q', d['microseconds']) if ('microseconds' in d) else None
+        return PackedValues(cls, array('q', d['ordinals']), microseconds, tz).unpack()
+    if 'microsecond' in d:
+        return batch.datetime_from_ordinal(cls, d['ordinal'], d['microsecond'], tz)
+    return batch.date_from_ordinal(cls, d['ordinal'])
+
+def dumps(obj: Any, **kwargs: Any) -> str:
+    """Serialize an object (possibly containing nerdcal values) to a JSON string."""
+    return json.dumps(obj, cls = JSONEncoder, **kwargs)
+
+def loads(s: str, **kwargs: Any) -> Any:
+    """Deserialize a JSON string produced by dumps."""
+    return json.loads(s, object_hook = json_object_hook, **kwargs)
+
+
+###########
+# MSGPACK #
+###########
+
+def msgpack_default(o: Any) -> Any:
+    """default hook for msgpack.packb, encoding nerdcal values (and PackedValues) as msgpack extension types."""
+    import msgpack
+    if isinstance(o, PackedValues):
+        flags = (_HAS_MICROSECONDS if (o.microseconds is not None) else 0) | (_HAS_TZINFO if (o.tzinfo is not None) else 0)
+        parts = [struct.pack('<BB', _class_index(o.cls), flags)]
+        if o.tzinfo is not None:
+            parts.append(struct.pack('<q', _utcoffset_us(o.tzinfo)))
+        parts.append(_int64_bytes(o.ordinals))
+        if o.microseconds is not None:
+            parts.append(_int64_bytes(o.microseconds))
+        return msgpack.ExtType(EXT_PACKED, b''.join(parts))
+    if isinstance(o, Date):
+        return msgpack.ExtType(EXT_VALUE, struct.pack('<Bq', _class_index(type(o)), o.toordinal()))
+    if isinstance(o, Datetime):
+        t = o.timetz()
+        data = struct.pack('<Bqq', _class_index(type(o)), o.date().toordinal(), microsecond_of_day(t))
+        if t.tzinfo is not None:
+            data += struct.pack('<q', _utcoffset_us(t.tzinfo))
+        return msgpack.ExtType(EXT_VALUE, data)
+    raise TypeError(f'cannot serialize object of type {type(o).__name__}')
+
+def msgpack_ext_hook(code: int, data: bytes) -> Any:
+    """ext_hook for msgpack.unpackb, decoding the extension types produced by msgpack_default."""
+    import msgpack
+    if code == EXT_VALUE:
+        cls = CLASSES[data[0]]
+        if len(data) == 9:
+            return batch.date_from_ordinal(cls, struct.unpack_from('<q', data, 1)[0])
+        (n, us) = struct.unpack_from('<qq', data, 1)
+        tz = _timezone(struct.unpack_from('<q', data, 17)[0]) if (len(data) == 25) else None
+        return batch.datetime_from_ordinal(cls, n, us, tz)
+    if code == EXT_PACKED:
+        (index, flags) = struct.unpack_from('<BB', data)
+        offset = 2
+        tz = None
+        if flags & _HAS_TZINFO:
+            tz = _timezone(struct.unpack_from('<q', data, offset)[0])
+            offset += 8
+        values = _int64_array(data[offset:])
+        if flags & _HAS_MICROSECONDS:
+            half = len(values) // 2
+            return PackedValues(CLASSES[index], values[:half], values[half:], tz).unpack()
+        return PackedValues(CLASSES[index], values).unpack()
+    return msgpack.ExtType(code, data)
+
+def packb(obj: Any, **kwargs: Any) -> bytes:
+    """Serialize an object (possibly containing nerdcal values) with msgpack."""
+    import msgpack
+    return msgpack.packb(pack(obj), default = msgpack_default, **kwargs)
+
+def unpackb(data: bytes, **kwargs: Any) -> Any:
+    """Deserialize msgpack data produced by packb."""
+    import msgpack
+    return msgpack.unpackb(data, ext_hook = msgpack_ext_hook, **kwargs)
@@ -0,0 +1,267 @@
+"""Local HTTP/JSON conversion service (standard library only).
+
+Run with: python -m nerdcal serve [--host HOST] [--port PORT] [--cache-size N]
+
+By default the server binds to localhost only. Endpoints:
+
+    GET  /convert?date=YYYY-MM-DD     convert a Gregorian date
+    GET  /convert?ordinal=N           convert an ordinal (day 1 is January 1 of year 1)
+    GET  /convert?timestamp=T         convert a POSIX timestamp (in UTC)
+    GET  /today                       convert the current local date
+    POST /convert                     convert a batch: the body is a JSON list of objects with one of the keys date/ordinal/timestamp (invalid items yield {"error": ...} in the result list)
+    GET  /calendar/CAL/YEAR/PERIOD    grid of a month (IFC, Positivist) or season (Seasonal), where CAL is ifc, positivist, or seasonal
+
+Each conversion result contains the Gregorian date and its representation in every calendar (null for dates beyond a calendar's range, e.g. the Seasonal calendar ends on 9999-12-20; for timestamps, the time of day is included as well). An optional "calendars" query parameter (comma-separated) restricts the calendars in the result.
+
+Connections are kept alive (HTTP/1.1), and requests pipelined on a connection are answered in order. Per-day conversions and grids come from LRU caches keyed by (calendar, ordinal) and (calendar, year, period); their hit rates are reported by nerdcal.stats()."""
+
+import asyncio
+from datetime import date, datetime, timezone
+from functools import lru_cache
+import json
+from typing import Any, Dict, Optional, Sequence, Tuple, Type
+from urllib.parse import parse_qs, urlsplit
+
+from nerdcal import batch
+from nerdcal._base import Date
+from nerdcal.batch import CALENDARS
+from nerdcal.instrument import register_cache
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8645
+DEFAULT_CACHE_SIZE = 65536
+MAX_HEADERS = 100
+MAX_BODY_SIZE = 1 << 20
+MAX_BATCH_SIZE = 10000
+REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed', 413: 'Payload Too Large', 500: 'Internal Server Error'}
+
+
+class HTTPError(Exception):
+    """Error to be reported to the client with the given status code."""
+
+    def __init__(self, status: int, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+###############
+# CONVERSIONS #
+###############
+
+def _period_name(cls: Type[Date], period: int) -> str:
+    names = cls.season_names() if hasattr(cls, 'season_names') else cls.month_names()
+    return names[period - 1]
+
+def _day_info(calendar: str, n: int) -> Dict[str, Any]:
+    """Representation of the day with ordinal n in a calendar."""
+    cls = CALENDARS[calendar]
+    d = batch.date_from_ordinal(cls, n)
+    iso = d.isoformat()
+    (period, day) = (int(iso[5:7]), int(iso[8:10]))
+    wd = d.weekday()
+    weekday_names = cls.weekday_names()
+    return {
+        'iso': iso,
+        'year': d.get_year(),
+        'period': period,
+        'period_name': _period_name(cls, period),
+        'day': day,
+        'weekday': wd,
+        'weekday_name': weekday_names[wd] if (wd < len(weekday_names)) else None,
+        'intercalary': wd >= len(weekday_names),
+    }
+
+def _grid(calendar: str, year: int, period: int) -> Dict[str, Any]:
+    """Grid of a period (month or season) of a year: a list of weeks (lists of ISO dates), and the intercalary days, in date order."""
+    cls = CALENDARS[calendar]
+    try:
+        first = cls(year, period, 1)
+    except ValueError as e:
+        raise HTTPError(404, str(e)) from None
+    weekday_names = cls.weekday_names()
+    (weeks, intercalary) = ([], [])
+    n = first.toordinal()
+    (_, max_ordinal) = batch.ordinal_range(cls)
+    while n <= max_ordinal:
+        info = _day_info(calendar, n)
+        if (info['year'], info['period']) != (year, period):
+            break
+        if info['intercalary']:
+            intercalary.append(info['iso'])
+        else:
+            if (not weeks) or (len(weeks[-1]) == len(weekday_names)):
+                weeks.append([])
+            weeks[-1].append(info['iso'])
+        n += 1
+    return {'calendar': calendar, 'year': year, 'period': period, 'period_name': _period_name(cls, period), 'weekday_names': weekday_names, 'weeks': weeks, 'intercalary': intercalary}
+
+_cached_day_info = _day_info
+_cached_grid = _grid
+
+def configure_caches(cache_size: int) -> None:
+    """(Re)create the LRU caches for day conversions and grids with the given size."""
+    global _cached_day_info, _cached_grid
+    _cached_day_info = lru_cache(maxsize = cache_size)(_day_info)
+    _cached_grid = lru_cache(maxsize = max(1, cache_size // 64))(_grid)
+    register_cache('server.day_info', _cached_day_info)
+    register_cache('server.grid', _cached_grid)
+
+configure_caches(DEFAULT_CACHE_SIZE)
+
+def _parse_calendars(value: Optional[str]) -> Sequence[str]:
+    if value is None:
+        return list(CALENDARS)
+    names = [name.strip() for name in value.split(',') if name.strip()]
+    for name in names:
+        if name not in CALENDARS:
+            raise HTTPError(400, f'unknown calendar: {name!r}')
+    return names
+
+def convert(query: Dict[str, Any], calendars: Sequence[str]) -> Dict[str, Any]:
+    """Convert a single query (a dict with one of the keys 'date', 'ordinal', 'timestamp')."""
+    time_str = None
+    try:
+        if 'date' in query:
+            n = date.fromisoformat(str(query['date'])).toordinal()
+        elif 'ordinal' in query:
+            n = int(query['ordinal'])
+        elif 'timestamp' in query:
+            dt = datetime.fromtimestamp(float(query['timestamp']), tz = timezone.utc)
+            (n, time_str) = (dt.toordinal(), dt.timetz().isoformat())
+        else:
+            raise HTTPError(400, 'expected one of: date, ordinal, timestamp')
+    except (TypeError, ValueError, OverflowError, OSError) as e:
+        raise HTTPError(400, f'invalid query: {e}') from None
+    if not 1 <= n <= date.max.toordinal():
+        raise HTTPError(400, f'ordinal out of range: {n}')
+    result: Dict[str, Any] = {'ordinal': n, 'gregorian': date.fromordinal(n).isoformat()}
+    if time_str is not None:
+        result['time'] = time_str
+    for calendar in calendars:
+        (lo, hi) = batch.ordinal_range(CALENDARS[calendar])
+        result[calendar] = _cached_day_info(calendar, n) if (lo <= n <= hi) else None
+    return result
+
+
+############
+# HANDLING #
+############
+
+def handle_request(method: str, target: str, body: bytes) -> Tuple[int, Any]:
+    """Handle a request, returning (status, JSON-serializable result)."""
+    url = urlsplit(target)
+    params = {key: values[-1] for (key, values) in parse_qs(url.query).items()}
+    parts = [part for part in url.path.split('/') if part]
+    calendars = _parse_calendars(params.pop('calendars', None))
+    if parts == ['convert']:
+        if method == 'GET':
+            return (200, convert(params, calendars))
+        if method == 'POST':
+            try:
+                queries = json.loads(body)
+            except ValueError as e:
+                raise HTTPError(400, f'invalid JSON: {e}') from None
+            if not isinstance(queries, list) or not all(isinstance(query, dict) for query in queries):
+                raise HTTPError(400, 'expected a JSON list of objects')
+            if len(queries) > MAX_BATCH_SIZE:
+                raise HTTPError(413, f'batch size must be at most {MAX_BATCH_SIZE}')
+            results = []
+            for query in queries:
+                try:
+                    results.append(convert(query, calendars))
+                except (HTTPError, ValueError) as e:  # report errors per query, rather than failing the whole batch
+                    results.append({'error': str(e)})
+            return (200, results)
+        raise HTTPError(405, f'method not allowed: {method}')
+    if method != 'GET':
+        raise HTTPError(405, f'method not allowed: {method}')
+    if parts == ['today']:
+        return (200, convert({'ordinal': date.today().toordinal()}, calendars))
+    if (len(parts) == 4) and (parts[0] == 'calendar'):
+        if parts[1] not in CALENDARS:
+            raise HTTPError(404, f'unknown calendar: {parts[1]!r}')
+        try:
+            (year, period) = (int(parts[2]), int(parts[3]))
+        except ValueError:
+            raise HTTPError(404, 'year and period must be integers') from None
+        return (200, _cached_grid(parts[1], year, period))
+    raise HTTPError(404, f'not found: {url.path}')
+
+def _response(status: int, result: Any, keep_alive: bool) -> bytes:
+    body = json.dumps(result, separators = (',', ':')).encode('utf-8')
+    head = f'HTTP/1.1 {status} {REASONS.get(status, "")}\r\nContent-Type: application/json\r\nContent-Length: {len(body)}\r\n'
+    if not keep_alive:
+        head += 'Connection: close\r\n'
+    return head.encode('ascii') + b'\r\n' + body
+
+async def _readline(reader: asyncio.StreamReader) -> bytes:
+    try:
+        return await reader.readline()
+    except ValueError:  # longer than the stream's limit (64 KiB by default)
+        raise HTTPError(400, 'line too long') from None
+
+async def _read_request(reader: asyncio.StreamReader) -> Optional[Tuple[str, str, str, Dict[str, str], bytes]]:
+    """Read one request from a connection, returning (method, target, version, headers, body), or None at EOF."""
+    line = await _readline(reader)
+    if not line.strip():
+        return None
+    try:
+        (method, target, version) = line.decode('latin-1').split()
+    except ValueError:
+        raise HTTPError(400, 'malformed request line') from None
+    headers = {}
+    while True:
+        line = await _readline(reader)
+        if line in (b'\r\n', b'\n', b''):
+            break
+        if len(headers) >= MAX_HEADERS:
+            raise HTTPError(400, 'too many headers')
+        (key, _, value) = line.decode('latin-1').partition(':')
+        headers[key.strip().lower()] = value.strip()
+    try:
+        length = int(headers.get('content-length', 0))
+    except ValueError:
+        raise HTTPError(400, 'invalid Content-Length') from None
+    if length > MAX_BODY_SIZE:
+        raise HTTPError(413, f'body must be at most {MAX_BODY_SIZE} bytes')
+    body = await reader.readexactly(length) if length else b''
+    return (method, target, version, headers, body)
+
+async def handle_connection(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    """Serve requests on a connection until the client closes it (or asks to)."""
+    try:
+        while True:
+            try:
+                request = await _read_request(reader)
+            except HTTPError as e:
+                writer.write(_response(e.status, {'error': str(e)}, False))
+                break
+            if request is None:
+                break
+            (method, target, version, headers, body) = request
+            connection = headers.get('connection', '').lower()
+            keep_alive = (connection != 'close') if (version == 'HTTP/1.1') else (connection == 'keep-alive')
+            try:
+                (status, result) = handle_request(method, target, body)
+            except HTTPError as e:
+                (status, result) = (e.status, {'error': str(e)})
+            except Exception as e:  # don't let a bug take down the connection silently
+                (status, result) = (500, {'error': repr(e)})
+            writer.write(_response(status, result, keep_alive))
+            # (only blocks if the client is not reading its responses)
+            await writer.drain()
+            if not keep_alive:
+                break
+        await writer.drain()
+    except (ConnectionError, asyncio.IncompleteReadError):
+        pass
+    finally:
+        writer.close()
+
+async def serve(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> None:
+    """Run the server forever."""
+    server = await asyncio.start_server(handle_connection, host, port)
+    addresses = ', '.join(str(sock.getsockname()) for sock in server.sockets)
+    print(f'Serving nerdcal on {addresses}', flush = True)
+    async with server:
+        await server.serve_forever()
@@ -0,0 +1,152 @@
+"""SQLite integration.
+
+Provides adapters/converters so that nerdcal values are stored as compact integers, and deterministic SQL functions for calendar conversion inside the database (so they can back expression indexes).
+
+Dates are stored as their ordinal number (day 1 is January 1 of year 1). Since the ordinal is the same in every calendar, a column written with IFCDate values can be queried with the Seasonal functions, and vice versa.
+Datetimes are stored as the number of microseconds since 0001-01-01 00:00:00. Timezone-aware datetimes are converted to UTC first, and are read back as naive UTC datetimes.
+
+Example:
+
+    register_adapters()
+    conn = sqlite3.connect(path, detect_types = sqlite3.PARSE_DECLTYPES)
+    register_functions(conn)
+    conn.execute('CREATE TABLE events (day IFCDATE)')
+    conn.execute('CREATE INDEX events_ifc_month ON events (ifc_year(day), ifc_month(day))')
+    conn.execute('SELECT * FROM events WHERE ifc_year(day) = 2024 AND ifc_month(day) = 7')"""
+
+from dataclasses import fields
+from datetime import date, time, timezone
+from functools import lru_cache
+import sqlite3
+import sys
+from typing import Any, Callable, Dict, Optional, Tuple, Type
+
+from nerdcal import batch
+from nerdcal._base import Date, Datetime, microsecond_of_day
+from nerdcal.batch import US_PER_DAY
+from nerdcal.ifc import IFCDatetime
+from nerdcal.instrument import register_cache
+from nerdcal.positivist import PositivistDatetime
+from nerdcal.seasonal import SeasonalDatetime
+
+# whether functions can be registered as deterministic (which is required for their use in indexes)
+DETERMINISTIC_SUPPORTED = (sys.version_info >= (3, 8)) and (sqlite3.sqlite_version_info >= (3, 8, 3))
+
+_DATETIME_CLASSES: Dict[Type[Date], Type[Datetime]] = {cls._date_class: cls for cls in (IFCDatetime, PositivistDatetime, SeasonalDatetime)}
+
+# calendar name -> (Date class, Datetime class, name of the period field)
+CALENDARS = {name: (cls, _DATETIME_CLASSES[cls], fields(cls)[1].name) for (name, cls) in batch.CALENDARS.items()}
+
+
+###########
+# STORAGE #
+###########
+
+def adapt_date(d: Date) -> int:
+    """Convert a Date to its ordinal."""
+    return d.toordinal()
+
+def adapt_datetime(dt: Datetime) -> int:
+    """Convert a Datetime to microseconds since 0001-01-01 00:00:00 (UTC, if timezone-aware)."""
+    if dt.tzinfo is None:
+        (ordinal, t) = (dt.date().toordinal(), dt.time())
+    else:
+        pydt = dt.todatetime().astimezone(timezone.utc)
+        (ordinal, t) = (pydt.toordinal(), pydt.time())
+    return (ordinal - 1) * US_PER_DAY + microsecond_of_day(t)
+
+def _split_datetime_int(value: int) -> Tuple[int, time]:
+    """Split a stored datetime integer into (ordinal, time)."""
+    days, us = divmod(value, US_PER_DAY)
+    seconds, microsecond = divmod(us, 1000000)
+    minutes, second = divmod(seconds, 60)
+    hour, minute = divmod(minutes, 60)
+    return (days + 1, time(hour, minute, second, microsecond))
+
+def _make_date_converter(cls: Type[Date]) -> Callable[[bytes], Date]:
+    def convert(value: bytes) -> Date:
+        return cls.fromordinal(int(value))
+    return convert
+
+def _make_datetime_converter(cls: Type[Datetime]) -> Callable[[bytes], Datetime]:
+    def convert(value: bytes) -> Datetime:
+        (ordinal, t) = _split_datetime_int(int(value))
+        return cls.combine(cls._date_class.fromordinal(ordinal), t)
+    return convert
+
+def register_adapters() -> None:
+    """Register sqlite3 adapters for all nerdcal Date/Datetime types, and converters for the declared column types IFCDATE, IFCDATETIME, POSITIVISTDATE, POSITIVISTDATETIME, SEASONALDATE, and SEASONALDATETIME.
+    Converters only take effect on connections opened with detect_types = sqlite3.PARSE_DECLTYPES."""
+    for (name, (date_cls, datetime_cls, _)) in CALENDARS.items():
+        sqlite3.register_adapter(date_cls, adapt_date)
+        sqlite3.register_adapter(datetime_cls, adapt_datetime)
+        sqlite3.register_converter(f'{name.upper()}DATE', _make_date_converter(date_cls))
+        sqlite3.register_converter(f'{name.upper()}DATETIME', _make_datetime_converter(datetime_cls))
+
+
+#################
+# SQL FUNCTIONS #
+#################
+
+def _to_ordinal(value: Any) -> Optional[int]:
+    """Convert a SQL argument to an ordinal.
+    Accepts an ordinal (integer) or a Gregorian ISO date/datetime string (as produced by SQLite's date functions).
+    Returns None for anything else (NULL, REAL, BLOB, or a malformed string), so that one bad row yields NULL rather than aborting the statement."""
+    if isinstance(value, int):
+        return value
+    if isinstance(value, str):
+        try:
+            return date.fromisoformat(value[:10]).toordinal()
+        except ValueError:
+            return None
+    return None
+
+def datetime_ordinal(value: Any) -> Optional[int]:
+    """Convert a stored datetime integer (or Gregorian ISO datetime string) to the ordinal of its date."""
+    if value is None:
+        return None
+    if isinstance(value, int):
+        return value // US_PER_DAY + 1
+    return _to_ordinal(value)
+
+@lru_cache(maxsize = 4096)
+def _date_from_ordinal(cls: Type[Date], n: int) -> Date:
+    return cls.fromordinal(n)
+
+register_cache('sqlite._date_from_ordinal', _date_from_ordinal)
+
+def _make_function(cls: Type[Date], getter: Callable[[Date], Any]) -> Callable[[Any], Any]:
+    (lo, hi) = (cls.min.toordinal(), cls.max.toordinal())
+    def func(value: Any) -> Any:
+        n = _to_ordinal(value)
+        # like SQLite's own date functions, return NULL for invalid or out-of-range dates (rather than aborting the statement)
+        if (n is None) or not (lo <= n <= hi):
+            return None
+        return getter(_date_from_ordinal(cls, n))
+    return func
+
+def sql_functions() -> Dict[str, Callable[[Any], Any]]:
+    """Mapping from SQL function names to single-argument Python functions.
+
+    For each calendar (ifc, positivist, seasonal), the following are provided:
+        {cal}_year, {cal}_{period}, {cal}_day, {cal}_weekday, to_{cal}_iso
+    where {period} is 'month' or 'season'. Each function takes an ordinal or a Gregorian ISO date string, and returns NULL for any other argument, or if the date is out of the calendar's range.
+    In addition, datetime_ordinal converts a stored datetime integer to an ordinal."""
+    funcs = {}
+    for (name, (date_cls, _, period)) in CALENDARS.items():
+        funcs[f'{name}_year'] = _make_function(date_cls, lambda d: d.year)
+        funcs[f'{name}_{period}'] = _make_function(date_cls, lambda d, period = period: getattr(d, period))
+        funcs[f'{name}_day'] = _make_function(date_cls, lambda d: d.day)
+        funcs[f'{name}_weekday'] = _make_function(date_cls, lambda d: d.weekday())
+        funcs[f'to_{name}_iso'] = _make_function(date_cls, lambda d: d.isoformat())
+    funcs['datetime_ordinal'] = datetime_ordinal
+    return funcs
+
+def register_functions(conn: sqlite3.Connection) -> None:
+    """Register the SQL functions from sql_functions() on a connection.
+    They are marked deterministic where supported (Python 3.8+, SQLite 3.8.3+; see DETERMINISTIC_SUPPORTED), allowing their use in indexes."""
+    for (name, func) in sql_functions().items():
+        if DETERMINISTIC_SUPPORTED:
+            conn.create_function(name, 1, func, deterministic = True)
+        else:
+            conn.create_function(name, 1, func)
@@ -0,0 +1,201 @@
+"""Exhaustive round-trip verification of the calendar implementations.
+
+For each calendar, every representable ordinal is checked:
+
+    ordinal:    fromordinal(n).toordinal() == n
+    isoformat:  fromisoformat(d.isoformat()) == d
+    weekday:    weekday() is in range, proper weekdays advance by one (cyclically) from one proper weekday to the next, skipping intercalary days,
+                and each month (or Seasonal half-season) starts on the first weekday (see reference_weekday)
+    batch:      the nerdcal.batch kernels (fields, weekdays, isoformat, fromisoformat) round-trip, and agree with the scalar results
+
+The batch kernels and the weekday rules are checked on every ordinal. The scalar (reference) implementation costs about 40 microseconds per ordinal, several times as much as the kernels, so by default it is only run on the first and last day of every year, and on every SAMPLE_STRIDE-th ordinal (which, over the full range, covers every day of both leap and non-leap years many times). With full = True (--full), it is run on every ordinal.
+
+The sweep is split into chunks which run across a process pool. The first mismatch (lowest ordinal) of each check is reported.
+
+Usage: python -m nerdcal.verify [-w WORKERS] [--calendar NAME ...] [--start N] [--stop N] [--full]"""
+
+import argparse
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+import os
+import sys
+import time
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple, Type
+
+from nerdcal import batch
+from nerdcal._base import Date
+from nerdcal.batch import CALENDARS
+from nerdcal.seasonal import MIDSEASON_DAY, SeasonalDate
+
+CHECKS = ['ordinal', 'isoformat', 'weekday', 'batch']
+CHUNK_SIZE = 20000
+# outside of full mode, the scalar implementation is checked on ordinals divisible by this (a prime, so the sampled days drift through the year)
+SAMPLE_STRIDE = 41
+
+
+class Mismatch(NamedTuple):
+    """A failed check at a given ordinal."""
+    ordinal: int
+    message: str
+
+
+############
+# CHECKING #
+############
+
+def reference_weekday(cls: Type[Date], day: int) -> int:
+    """Expected weekday() of a proper (non-intercalary) day of a month (or Seasonal season), counting from the first weekday at the start of each month (or Seasonal half-season)."""
+    if issubclass(cls, SeasonalDate) and (day > MIDSEASON_DAY):
+        day -= MIDSEASON_DAY
+    return (day - 1) % len(cls.weekday_names())
+
+def _previous_weekday(cls: Type[Date], n: int, lo: int) -> Optional[Tuple[int, int]]:
+    """Find the (ordinal, weekday) of the last proper weekday before ordinal n, if any."""
+    days_in_week = len(cls.weekday_names())
+    ordinals = range(max(lo, n - days_in_week), n)
+    for (m, wd) in zip(reversed(ordinals), reversed(batch.weekdays(cls, ordinals))):
+        if wd < days_in_week:
+            return (m, wd)
+    return None
+
+def _first_difference(xs: Sequence, ys: Sequence) -> int:
+    return next(i for (i, (x, y)) in enumerate(zip(xs, ys)) if x != y)
+
+def _scalar_indices(ordinals: range, years: Sequence[int], full: bool) -> List[int]:
+    """Indices of the ordinals on which to run the scalar checks: all of them if full, otherwise the first and last day of each year, and the multiples of SAMPLE_STRIDE."""
+    if full:
+        return list(range(len(ordinals)))
+    indices = set(range((-ordinals.start) % SAMPLE_STRIDE, len(ordinals), SAMPLE_STRIDE))
+    indices.update((0, len(ordinals) - 1))
+    for i in range(1, len(ordinals)):
+        if years[i] != years[i - 1]:
+            indices.update((i - 1, i))
+    return sorted(indices)
+
+def check_chunk(cls: Type[Date], start: int, stop: int, full: bool = False) -> Dict[str, Mismatch]:
+    """Run all checks on the ordinals in [start, stop), returning the first mismatch of each failed check.
+    If full = False, the scalar implementation is only run on some of the ordinals (see _scalar_indices)."""
+    failures: Dict[str, Mismatch] = {}
+    def fail(check: str, n: int, message: str) -> None:
+        prev = failures.get(check)
+        if (prev is None) or (n < prev.ordinal):
+            failures[check] = Mismatch(n, message)
+    (lo, _) = batch.ordinal_range(cls)
+    days_in_week = len(cls.weekday_names())
+    ordinals = range(start, stop)
+    if not ordinals:
+        return failures
+    # batch kernels (every ordinal)
+    (years, periods, days) = batch.to_fields(cls, ordinals)
+    batch_weekdays = batch.weekdays(cls, ordinals)
+    batch_isos = batch.isoformat(cls, ordinals)
+    batch_ordinals = batch.fromisoformat(cls, batch_isos)
+    if batch_ordinals != array('q', ordinals):
+        i = _first_difference(batch_ordinals, ordinals)
+        fail('batch', ordinals[i], f'batch fromisoformat({batch_isos[i]!r}) = {batch_ordinals[i]}')
+    # weekday rules (every ordinal)
+    expected = [reference_weekday(cls, day) for day in range(max(days) + 1)]
+    prev = _previous_weekday(cls, start, lo)
+    for (i, wd) in enumerate(batch_weekdays):
+        if wd >= days_in_week:
+            # intercalary days have one of two special values
+            if wd >= days_in_week + 2:
+                fail('weekday', ordinals[i], f'weekday of {cls.__name__}{(years[i], periods[i], days[i])} is {wd}, which is out of range')
+        elif wd < 0:
+            fail('weekday', ordinals[i], f'weekday of {cls.__name__}{(years[i], periods[i], days[i])} is {wd}, which is out of range')
+        else:
+            if (prev is not None) and (wd != (prev[1] + 1) % days_in_week):
+                fail('weekday', ordinals[i], f'weekday of {cls.__name__}{(years[i], periods[i], days[i])} is {wd}, but the previous proper weekday (ordinal {prev[0]}) was {prev[1]}')
+            elif wd != expected[days[i]]:
+                fail('weekday', ordinals[i], f'weekday of {cls.__name__}{(years[i], periods[i], days[i])} is {wd}, expected {expected[days[i]]}')
+            prev = (ordinals[i], wd)
+    # scalar implementation, and its agreement with the batch kernels
+    for i in _scalar_indices(ordinals, years, full):
+        n = ordinals[i]
+        try:
+            d = cls.fromordinal(n)
+        except Exception as e:
+            fail('ordinal', n, f'fromordinal raised {e!r}')
+            continue
+        m = d.toordinal()
+        if m != n:
+            fail('ordinal', n, f'fromordinal({n}) = {d!r}, whose toordinal() = {m}')
+        iso = d.isoformat()
+        try:
+            d2 = cls.fromisoformat(iso)
+            if d2 != d:
+                fail('isoformat', n, f'fromisoformat({iso!r}) = {d2!r} != {d!r}')
+        except Exception as e:
+            fail('isoformat', n, f'fromisoformat({iso!r}) raised {e!r}')
+        (period, day) = d._period_and_day()
+        wd = d.weekday()
+        if (wd < days_in_week) and (wd != reference_weekday(cls, day)):
+            fail('weekday', n, f'{d!r}.weekday() = {wd}, expected {reference_weekday(cls, day)}')
+        fields = (d.get_year(), period, day)
+        batch_fields = (years[i], periods[i], days[i])
+        if batch_fields != fields:
+            fail('batch', n, f'batch fields {batch_fields} != {fields}')
+        elif batch_weekdays[i] != wd:
+            fail('batch', n, f'batch weekday {batch_weekdays[i]} != {wd}')
+        elif batch_isos[i] != iso:
+            fail('batch', n, f'batch isoformat {batch_isos[i]!r} != {iso!r}')
+    return failures
+
+def verify(calendars: Optional[Iterable[Type[Date]]] = None, start: Optional[int] = None, stop: Optional[int] = None, workers: Optional[int] = None, chunk_size: int = CHUNK_SIZE, full: bool = False) -> Dict[Type[Date], Dict[str, Optional[Mismatch]]]:
+    """Run the checks for each calendar (by default, all of them) over the ordinals in [start, stop) (by default, the calendar's full range).
+    If full = True, the scalar implementation is checked on every ordinal, rather than a sample (which takes several times as long).
+    Returns a dict mapping each calendar to a dict from check name to its first mismatch (or None if it passed)."""
+    calendars = list(CALENDARS.values()) if (calendars is None) else list(calendars)
+    workers = workers or os.cpu_count() or 1
+    tasks: List[Tuple[Type[Date], int, int, bool]] = []
+    for cls in calendars:
+        (lo, hi) = batch.ordinal_range(cls)
+        (lo, hi) = (lo if (start is None) else max(lo, start), hi + 1 if (stop is None) else min(hi + 1, stop))
+        tasks.extend((cls, i, min(i + chunk_size, hi), full) for i in range(lo, hi, chunk_size))
+    results: Dict[Type[Date], Dict[str, Optional[Mismatch]]] = {cls: dict.fromkeys(CHECKS) for cls in calendars}
+    def merge(cls: Type[Date], failures: Dict[str, Mismatch]) -> None:
+        for (check, mismatch) in failures.items():
+            prev = results[cls][check]
+            if (prev is None) or (mismatch.ordinal < prev.ordinal):
+                results[cls][check] = mismatch
+    if workers == 1:
+        for task in tasks:
+            merge(task[0], check_chunk(*task))
+    else:
+        with ProcessPoolExecutor(workers) as executor:
+            futures = [(task[0], executor.submit(check_chunk, *task)) for task in tasks]
+            for (cls, future) in futures:
+                merge(cls, future.result())
+    return results
+
+
+########
+# MAIN #
+########
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description = 'Exhaustive round-trip verification of the nerdcal calendars.')
+    parser.add_argument('-w', '--workers', type = int, help = 'number of worker processes (default: number of CPUs)')
+    parser.add_argument('--calendar', choices = list(CALENDARS), nargs = '+', help = 'calendars to verify (default: all)')
+    parser.add_argument('--start', type = int, help = 'first ordinal to check')
+    parser.add_argument('--stop', type = int, help = 'check ordinals below this')
+    parser.add_argument('--full', action = 'store_true', help = 'run the scalar checks on every ordinal, not just a sample')
+    args = parser.parse_args(argv)
+    calendars = None if (args.calendar is None) else [CALENDARS[name] for name in args.calendar]
+    t0 = time.perf_counter()
+    results = verify(calendars, start = args.start, stop = args.stop, workers = args.workers, full = args.full)
+    elapsed = time.perf_counter() - t0
+    ok = True
+    for (cls, checks) in results.items():
+        for (check, mismatch) in checks.items():
+            if mismatch is None:
+                print(f'{cls.__name__:<16} {check:<10} OK')
+            else:
+                ok = False
+                print(f'{cls.__name__:<16} {check:<10} FAIL at ordinal {mismatch.ordinal}: {mismatch.message}')
+    print(f'Finished in {elapsed:.1f} seconds.')
+    return 0 if ok else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,20 @@
+from nerdcal import batch
+from nerdcal.ifc import IFCDate
+from nerdcal.positivist import PositivistDate
+from nerdcal.seasonal import SeasonalDate
+
+
+def test_batch_matches_scalar():
+    for cls in (IFCDate, PositivistDate, SeasonalDate):
+        (lo, hi) = batch.ordinal_range(cls)
+        ordinals = list(range(lo, lo + 800)) + list(range(hi - 800, hi + 1))
+        (years, periods, days) = batch.to_fields(cls, ordinals)
+        isos = batch.isoformat(cls, ordinals)
+        weekdays = batch.weekdays(cls, ordinals)
+        for (i, n) in enumerate(ordinals):
+            d = cls.fromordinal(n)
+            assert isos[i] == d.isoformat()
+            assert cls.fromisoformat(isos[i]) == d
+            assert (years[i], periods[i], days[i]) == tuple(int(s) for s in d.isoformat().split('-'))
+            assert weekdays[i] == d.weekday()
+        assert list(batch.fromisoformat(cls, isos)) == ordinals
@@ -0,0 +1,52 @@
+from datetime import datetime, timedelta, timezone
+
+from nerdcal.clock import MAX_CACHED_ZONES, Clock
+from nerdcal.ifc import IFCDate
+from nerdcal.seasonal import SeasonalDate, SeasonalDatetime
+
+
+class FakeTime:
+
+    def __init__(self, t):
+        self.t = t
+
+    def __call__(self):
+        return self.t
+
+def test_clock_today_caches_per_day():
+    fake = FakeTime(datetime(2024, 6, 18, 12).timestamp())
+    clock = Clock(time_source = fake)
+    today = clock.today()
+    assert today == IFCDate(2024, 7, 1)
+    fake.t += 3600
+    assert clock.today() is today
+    fake.t += 86400
+    assert clock.today() == IFCDate(2024, 7, 2)
+
+def test_clock_now_caches_per_second():
+    fake = FakeTime(1719792000.25)
+    clock = Clock(SeasonalDatetime, time_source = fake)
+    now = clock.now(timezone.utc)
+    assert now == SeasonalDatetime.fromdatetime(datetime.fromtimestamp(fake.t, timezone.utc))
+    fake.t += 0.5
+    later = clock.now(timezone.utc)
+    assert later.microsecond == 750000
+    assert later.replace(microsecond = 250000) == now
+    fake.t += 1
+    utc = clock.utcnow()
+    assert utc.tzinfo is None
+    assert utc == SeasonalDatetime.fromdatetime(datetime.fromtimestamp(fake.t, timezone.utc).replace(tzinfo = None))
+    assert clock.today() == SeasonalDate.fromordinal(datetime.fromtimestamp(fake.t).toordinal())
+
+def test_clock_now_rounds_like_datetime():
+    fake = FakeTime(0.0)
+    clock = Clock(SeasonalDatetime, time_source = fake)
+    for t in [1719792000.3, 1719792000.0000005, 1719792000.9999996, 1719792001.9999999]:
+        fake.t = t
+        assert clock.now(timezone.utc) == SeasonalDatetime.fromdatetime(datetime.fromtimestamp(t, timezone.utc))
+
+def test_clock_cache_is_bounded():
+    clock = Clock(time_source = FakeTime(1719792000.0))
+    for hours in range(-12, 13):
+        clock.now(timezone(timedelta(hours = hours)))
+    assert len(clock._seconds) <= MAX_CACHED_ZONES
@@ -1,6 +1,24 @@
+import pytest
+
 from nerdcal.ifc import IFCDate, IFCDatetime
 
 
 def test_create_ifc_date():
     ifc = IFCDate(2019, 1, 1)
     assert ifc
+
+def test_ifc_weekday_leap_year():
+    # every month starts on a Sunday, including after Leap Day
+    assert IFCDate(2024, 6, 28).weekday() == 6
+    assert IFCDate(2024, 6, 29).weekday() == 8
+    assert IFCDate(2024, 7, 1).weekday() == 0
+    assert IFCDate(2024, 13, 28).weekday() == 6
+    assert IFCDate(2023, 7, 1).weekday() == 0
+
+def test_ifc_strftime():
+    assert IFCDate(2024, 6, 29).strftime('%A, %B %d, %Y (day %j)') == 'Leap Day, June 29, 2024 (day 169)'
+    assert IFCDatetime(2024, 7, 1, 13, 5).strftime('%a %b %d %H:%M %%') == 'Sun Sol 01 13:05 %'
+    # directives that the standard library would render for a Gregorian date are rejected
+    for fmt in ['%F', '%x', '%c', '%D', '%u', '%U', '%e']:
+        with pytest.raises(ValueError, match = 'unsupported'):
+            IFCDate(2024, 7, 1).strftime(fmt)
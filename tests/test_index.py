@@ -0,0 +1,45 @@
+import random
+
+from nerdcal.ifc import IFCDate
+from nerdcal.index import DateIndex
+from nerdcal.positivist import PositivistDate
+from nerdcal.seasonal import SeasonalDate
+
+
+def _random_dates(num_dates = 5000):
+    rng = random.Random(0)
+    return [IFCDate.fromordinal(rng.randint(IFCDate(2010, 1, 1).toordinal(), IFCDate(2030, 1, 1).toordinal())) for _ in range(num_dates)]
+
+def _expected(dates, calendar, predicate):
+    converted = [calendar.fromordinal(d.toordinal()) for d in dates]
+    return sorted((i for (i, d) in enumerate(converted) if predicate(d)), key = lambda i: (dates[i].toordinal(), i))
+
+def test_period_queries():
+    dates = _random_dates()
+    index = DateIndex.from_dates(dates)
+    assert list(index.period(2024, 7)) == _expected(dates, IFCDate, lambda d: (d.year, d.month) == (2024, 7))
+    assert list(index.week(2024, 6, 4)) == _expected(dates, IFCDate, lambda d: (d.year, d.month) == (2024, 6) and 22 <= d.day <= 28)
+    assert list(index.intercalary(2015, 2024)) == _expected(dates, IFCDate, lambda d: 2015 <= d.year <= 2024 and d.weekday() >= 7)
+    seasonal = index.with_calendar(SeasonalDate)
+    assert list(seasonal.period_day(37, 2015, 2024)) == _expected(dates, SeasonalDate, lambda d: 2015 <= d.year <= 2024 and d.day == 37)
+    assert list(seasonal.week(2020, 1, 8)) == _expected(dates, SeasonalDate, lambda d: (d.year, d.season) == (2020, 1) and 65 <= d.day <= 73)
+    positivist = index.with_calendar(PositivistDate)
+    assert list(positivist.period(2019, 13)) == _expected(dates, PositivistDate, lambda d: (d.year, d.month) == (2019, 13))
+
+def test_incremental_add():
+    dates = _random_dates()
+    index = DateIndex(IFCDate)
+    for i in range(0, len(dates), 100):
+        index.add(dates[i:i + 100])
+        assert len(index) == i + len(dates[i:i + 100])
+    assert list(index.ordinals) == sorted(d.toordinal() for d in dates)
+    assert list(index.between(IFCDate(2024, 7, 1), IFCDate(2024, 8, 1))) == list(index.period(2024, 7))
+
+def test_calendar_views_share_entries():
+    index = DateIndex(IFCDate, [IFCDate(2024, 7, 1)])
+    view = index.with_calendar(SeasonalDate)
+    index.add([IFCDate(2024, 7, 2)])
+    index.flush()
+    view.add([IFCDate(2024, 7, 3).toordinal()])
+    assert len(index) == len(view) == 3
+    assert list(view.dates()) == [SeasonalDate.fromordinal(n) for n in index.ordinals]
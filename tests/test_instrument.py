@@ -0,0 +1,47 @@
+import pytest
+
+import nerdcal
+from nerdcal.ifc import IFCDate
+from nerdcal.instrument import disable_stats, enable_stats, is_enabled
+from nerdcal.seasonal import SeasonalDate
+
+
+@pytest.fixture(autouse = True)
+def stats_disabled():
+    """Run each test with instrumentation disabled (e.g. even under NERDCAL_STATS=1), restoring the previous state afterward."""
+    count = 0
+    while is_enabled():
+        disable_stats()
+        count += 1
+    yield
+    for _ in range(count):
+        enable_stats()
+
+def test_disabled_has_no_wrappers():
+    assert not is_enabled()
+    assert '__wrapped__' not in IFCDate.__dict__['toordinal'].__dict__
+
+def test_profile_counts_calls():
+    with nerdcal.profile() as prof:
+        SeasonalDate.fromordinal(737000).toordinal()
+        IFCDate.fromordinal(737000).isoformat()
+    assert not is_enabled()
+    calls = prof['calls']
+    assert calls['SeasonalDate.fromordinal'].calls == 1
+    assert calls['Date.fromordinal'].calls == 2
+    assert calls['SeasonalDate.toordinal'].calls == 1
+    assert calls['IFCDate.__post_init__'].calls == 1
+    assert calls['IFCDate.isoformat'].seconds >= 0.0
+    nerdcal.reset_stats()
+    assert nerdcal.stats()['calls'] == {}
+
+def test_nested_profile():
+    with nerdcal.profile() as outer:
+        with nerdcal.profile() as inner:
+            IFCDate.fromordinal(737000)
+        # exiting the inner block leaves the outer one instrumented
+        assert is_enabled()
+        IFCDate.fromordinal(737001)
+    assert not is_enabled()
+    assert inner['calls']['Date.fromordinal'].calls == 1
+    assert outer['calls']['Date.fromordinal'].calls == 2
@@ -0,0 +1,32 @@
+import logging
+
+import pytest
+
+from nerdcal.ifc import IFCDatetime
+from nerdcal.log import CalendarFormatter
+from nerdcal.seasonal import SeasonalDatetime
+
+
+def _record(created):
+    record = logging.LogRecord('test', logging.INFO, __file__, 1, 'hello', None, None)
+    record.created = created
+    record.msecs = (created - int(created)) * 1000
+    return record
+
+def test_formatter_matches_calendar():
+    created = 1719792000.25  # 2024-07-01 00:00:00.25 UTC
+    formatter = CalendarFormatter('%(asctime)s %(message)s', datefmt = '%Y-%m-%d %H:%M:%S.%f %A %%f', utc = True)
+    expected = IFCDatetime.utcfromtimestamp(created).strftime('%Y-%m-%d %H:%M:%S.%f %A %%f')
+    assert formatter.format(_record(created)) == f'{expected} hello'
+    # a later record in the same second re-renders only the microseconds
+    assert formatter.format(_record(created + 0.5)).startswith(expected.replace('250000', '750000'))
+
+def test_formatter_default_format():
+    created = 1719792001.0
+    formatter = CalendarFormatter('%(asctime)s', calendar = SeasonalDatetime, utc = True)
+    expected = SeasonalDatetime.utcfromtimestamp(created).strftime('%Y-%m-%d %H:%M:%S')
+    assert formatter.format(_record(created)) == f'{expected},000'
+
+def test_formatter_rejects_gregorian_directives():
+    with pytest.raises(ValueError, match = 'unsupported'):
+        CalendarFormatter('%(asctime)s', datefmt = '%x %X')
@@ -0,0 +1,45 @@
+from array import array
+
+import pytest
+
+from nerdcal import batch, parallel
+from nerdcal.ifc import IFCDate
+from nerdcal.seasonal import SeasonalDate
+
+
+def test_parallel_matches_serial():
+    ordinals = list(range(730000, 730000 + 3 * parallel.MIN_SHARD_SIZE))
+    with parallel.Pool(workers = 3, calendars = [IFCDate, SeasonalDate]) as pool:
+        assert len(pool._shards(len(ordinals))) == 3
+        assert pool.to_fields(SeasonalDate, ordinals) == batch.to_fields(SeasonalDate, ordinals)
+        isos = pool.isoformat(IFCDate, ordinals)
+        assert isos == batch.isoformat(IFCDate, ordinals)
+        assert list(pool.fromisoformat(IFCDate, isos)) == ordinals
+        timestamps = [86400.5 * i for i in range(len(ordinals))]
+        assert pool.from_timestamps(timestamps) == batch.from_timestamps(timestamps)
+
+def test_parallel_without_shared_memory(monkeypatch):
+    # Python 3.7 fallback: shards are pickled to the workers
+    monkeypatch.setattr(parallel, 'SharedMemory', None)
+    ordinals = list(range(730000, 730000 + 2 * parallel.MIN_SHARD_SIZE))
+    with parallel.Pool(workers = 2, threads = False) as pool:
+        assert pool.weekdays(SeasonalDate, ordinals) == batch.weekdays(SeasonalDate, ordinals)
+        isos = pool.isoformat(IFCDate, ordinals)
+        assert isos == batch.isoformat(IFCDate, ordinals)
+        assert list(pool.fromisoformat(IFCDate, isos)) == ordinals
+
+def test_parallel_shared_arrays():
+    ordinals = list(range(730000, 730000 + 2 * parallel.MIN_SHARD_SIZE))
+    n = len(ordinals)
+    with parallel.Pool(workers = 2, threads = False) as pool:
+        with pool.shared_array('q', n) as shared, pool.shared_array('b', n) as weekdays, pool.shared_array('B', batch.ISO_WIDTH * n) as isos:
+            shared[:] = array('q', ordinals)
+            assert pool.weekdays(SeasonalDate, shared, out = weekdays) is weekdays
+            assert weekdays.tolist() == list(batch.weekdays(SeasonalDate, ordinals))
+            pool.isoformat(IFCDate, shared, out = isos)
+            assert batch.split_iso(isos.view) == batch.isoformat(IFCDate, ordinals)
+            shared[:] = array('q', bytes(8 * n))
+            pool.fromisoformat(IFCDate, isos, out = shared)
+            assert shared.tolist() == ordinals
+            with pytest.raises(ValueError):
+                pool.weekdays(SeasonalDate, shared, out = shared)
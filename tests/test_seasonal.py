@@ -0,0 +1,19 @@
+from nerdcal.seasonal import SeasonalDate
+
+
+def test_create_seasonal_date():
+    seasonal = SeasonalDate(2019, 1, 1)
+    assert seasonal
+
+def test_seasonal_leap_day_round_trip():
+    # the leap day (Winter 0) only occurs in leap years, between Winter 70 and 71
+    for (year, day) in [(2019, 70), (2019, 71), (2019, 73), (2020, 0), (2020, 70), (2020, 71)]:
+        d = SeasonalDate(year, 1, day)
+        assert SeasonalDate.fromordinal(d.toordinal()) == d
+    assert SeasonalDate(2020, 1, 71).toordinal() - SeasonalDate(2020, 1, 70).toordinal() == 2
+
+def test_seasonal_weekday():
+    # each month of four 9-day weeks starts on Mercury
+    assert [SeasonalDate(2021, 2, day).weekday() for day in (1, 9, 10, 36, 37, 38, 73)] == [0, 8, 0, 8, 9, 0, 8]
+    assert SeasonalDate(2020, 1, 0).weekday() == 10
+    assert SeasonalDate(2020, 1, 71).weekday() == 6
@@ -0,0 +1,65 @@
+from collections import namedtuple
+import copy
+from dataclasses import dataclass
+from datetime import time, timedelta, timezone
+import json
+import pickle
+
+import pytest
+
+import nerdcal
+from nerdcal import serialize
+from nerdcal.ifc import IFCDate, IFCDatetime
+from nerdcal.positivist import PositivistDate
+from nerdcal.seasonal import SeasonalDate, SeasonalDatetime
+
+
+VALUES = [
+    IFCDate(2024, 6, 29),
+    PositivistDate(2024, 13, 30),
+    SeasonalDate(2020, 1, 0),
+    SeasonalDatetime(2020, 3, 37, 23, 59, 59, 999999),
+    IFCDatetime(2019, 7, 1, 12, tzinfo = timezone(timedelta(hours = -5))),
+]
+
+
+def test_pickle_round_trip():
+    for value in VALUES:
+        restored = pickle.loads(pickle.dumps(value))
+        assert restored == value
+        assert type(restored) is type(value)
+    assert pickle.loads(pickle.dumps(VALUES)) == VALUES
+
+@dataclass(order = True, frozen = True)
+class TaggedDate(IFCDate):
+    tag: str = 'default'
+
+def test_pickle_subclass_with_extra_field():
+    value = TaggedDate(2024, 7, 1, tag = 'hello')
+    for restored in [pickle.loads(pickle.dumps(value)), copy.deepcopy(value)]:
+        assert type(restored) is TaggedDate
+        assert restored.tag == 'hello'
+        assert restored == value
+    # only the calendar's own classes use the compact form
+    assert b'_restore_date' in pickle.dumps(IFCDate(2024, 7, 1))
+    assert b'_restore_date' not in pickle.dumps(value)
+
+def test_json_round_trip():
+    dates = [IFCDate.fromordinal(n) for n in range(737000, 737100)]
+    obj = {'values': VALUES, 'dates': dates, 'other': [1, 'a']}
+    s = serialize.dumps(obj)
+    assert s.count(serialize.TAG_KEY) == len(VALUES) + 1
+    assert serialize.loads(s) == obj
+
+def test_json_named_tuples():
+    Point = namedtuple('Point', ['x', 'y'])
+    assert serialize.dumps({'p': Point(1, 2)}) == json.dumps({'p': Point(1, 2)})
+    obj = {'p': Point(IFCDate(2024, 7, 1), [IFCDate(2024, 7, 2)])}
+    assert serialize.loads(serialize.dumps(obj)) == {'p': [IFCDate(2024, 7, 1), [IFCDate(2024, 7, 2)]]}
+    assert serialize.dumps(nerdcal.stats())
+
+def test_msgpack_round_trip():
+    pytest.importorskip('msgpack')
+    dates = [SeasonalDatetime.combine(SeasonalDate.fromordinal(n), time(n % 24)) for n in range(737000, 737100)]
+    obj = {'values': VALUES, 'dates': dates}
+    assert serialize.unpackb(serialize.packb(obj)) == obj
@@ -0,0 +1,57 @@
+import asyncio
+import json
+import random
+
+from nerdcal import loadgen, server
+from nerdcal.ifc import IFCDate
+
+
+def test_handle_request():
+    (status, result) = server.handle_request('GET', '/convert?date=2024-06-18&calendars=ifc', b'')
+    assert status == 200
+    assert result['ifc']['iso'] == IFCDate(2024, 7, 1).isoformat()
+    assert result['ifc']['period_name'] == 'Sol'
+    assert 'seasonal' not in result
+    (status, results) = server.handle_request('POST', '/convert', json.dumps([{'ordinal': 739055}, {'ordinal': 0}]).encode())
+    assert results[0]['ifc'] == result['ifc']
+    assert 'error' in results[1]
+    (status, grid) = server.handle_request('GET', '/calendar/ifc/2024/6', b'')
+    assert [len(week) for week in grid['weeks']] == [7, 7, 7, 7]
+    assert grid['intercalary'] == ['2024-06-29']
+
+def test_beyond_calendar_range():
+    (status, result) = server.handle_request('GET', '/convert?date=9999-12-25', b'')
+    assert status == 200
+    assert result['seasonal'] is None
+    assert result['ifc']['iso'] == '9999-13-23'
+    (status, results) = server.handle_request('POST', '/convert', json.dumps([{'date': '9999-12-25'}, {'date': 'x'}]).encode())
+    assert status == 200
+    assert results[0] == result
+    assert 'error' in results[1]
+
+def test_line_too_long():
+    async def main():
+        srv = await asyncio.start_server(server.handle_connection, server.DEFAULT_HOST, 0)
+        port = srv.sockets[0].getsockname()[1]
+        async with srv:
+            (reader, writer) = await asyncio.open_connection(server.DEFAULT_HOST, port)
+            writer.write(b'GET /convert?' + b'x' * (1 << 17) + b' HTTP/1.1\r\n\r\n')
+            status_line = await reader.readline()
+            writer.close()
+            return status_line
+    assert asyncio.run(main()).startswith(b'HTTP/1.1 400')
+
+def test_serve_and_loadgen():
+    async def main():
+        srv = await asyncio.start_server(server.handle_connection, server.DEFAULT_HOST, 0)
+        port = srv.sockets[0].getsockname()[1]
+        async with srv:
+            return await loadgen.run(port = port, connections = 4, num_requests = 200, batch_size = 3, grid_fraction = 0.1)
+    summary = asyncio.run(main())
+    assert summary['requests'] == 200
+    # replay the requests of each connection: grid requests are a single conversion, the rest are batches of 3
+    methods = [loadgen._random_request(rng, 3, 0.1)[0] for rng in map(random.Random, range(4)) for _ in range(50)]
+    assert 0 < methods.count('GET') < 200
+    assert summary['conversions'] == methods.count('GET') + 3 * methods.count('POST')
+    assert summary['errors'] == 0
+    assert summary['p50'] <= summary['p99'] <= summary['max']
@@ -0,0 +1,55 @@
+import sqlite3
+
+import pytest
+
+from nerdcal.ifc import IFCDate, IFCDatetime
+from nerdcal.seasonal import SeasonalDate
+from nerdcal.sqlite import DETERMINISTIC_SUPPORTED, register_adapters, register_functions
+
+
+def _connect():
+    register_adapters()
+    conn = sqlite3.connect(':memory:', detect_types = sqlite3.PARSE_DECLTYPES)
+    register_functions(conn)
+    return conn
+
+def test_adapters_round_trip():
+    conn = _connect()
+    conn.execute('CREATE TABLE events (day IFCDATE, stamp IFCDATETIME)')
+    day = IFCDate(2024, 7, 15)
+    stamp = IFCDatetime(2024, 6, 29, 12, 30, 15, 250)
+    conn.execute('INSERT INTO events VALUES (?, ?)', (day, stamp))
+    assert conn.execute('SELECT typeof(day), typeof(stamp) FROM events').fetchone() == ('integer', 'integer')
+    assert conn.execute('SELECT day, stamp FROM events').fetchone() == (day, stamp)
+
+@pytest.mark.skipif(not DETERMINISTIC_SUPPORTED, reason = 'deterministic SQL functions require Python 3.8+')
+def test_sql_functions_with_index():
+    conn = _connect()
+    conn.execute('CREATE TABLE events (day IFCDATE)')
+    conn.execute('CREATE INDEX events_ifc_month ON events (ifc_year(day), ifc_month(day))')
+    conn.executemany('INSERT INTO events VALUES (?)', [(IFCDate(2024, month, 1),) for month in range(1, 14)])
+    rows = conn.execute('SELECT day FROM events WHERE ifc_year(day) = 2024 AND ifc_month(day) = 7').fetchall()
+    assert rows == [(IFCDate(2024, 7, 1),)]
+    plan = ' '.join(str(row) for row in conn.execute('EXPLAIN QUERY PLAN SELECT day FROM events WHERE ifc_year(day) = 2024 AND ifc_month(day) = 7'))
+    assert 'events_ifc_month' in plan
+    # functions also accept Gregorian ISO strings
+    d = SeasonalDate.fromordinal(IFCDate(2024, 7, 1).toordinal())
+    assert conn.execute("SELECT to_seasonal_iso('2024-06-18')").fetchone() == (d.isoformat(),)
+
+def test_sql_functions_out_of_range():
+    conn = _connect()
+    conn.execute('CREATE TABLE events (day IFCDATE)')
+    if DETERMINISTIC_SUPPORTED:
+        conn.execute('CREATE INDEX events_seasonal_season ON events (seasonal_season(day))')
+    # the last days of 9999 are beyond the end of the Seasonal calendar
+    conn.execute('INSERT INTO events VALUES (?)', (IFCDate(9999, 13, 29),))
+    assert conn.execute('SELECT ifc_month(day), seasonal_season(day), to_seasonal_iso(day) FROM events').fetchone() == (13, None, None)
+
+def test_sql_functions_invalid_arguments():
+    conn = _connect()
+    conn.execute('CREATE TABLE events (day)')
+    if DETERMINISTIC_SUPPORTED:
+        conn.execute('CREATE INDEX events_ifc_month ON events (ifc_month(day))')
+    conn.executemany('INSERT INTO events VALUES (?)', [('garbage',), (739000.0,), (b'\x00',), (None,)])
+    conn.execute("INSERT INTO events VALUES (julianday('now'))")
+    assert conn.execute('SELECT ifc_month(day), datetime_ordinal(day) FROM events').fetchall() == [(None, None)] * 5
@@ -0,0 +1,37 @@
+from nerdcal import batch, verify
+from nerdcal._base import MAX_ORDINAL
+from nerdcal.ifc import IFCDate
+
+
+def test_verify_edges():
+    for (start, stop) in [(-20, 800), (730000, 730800), (MAX_ORDINAL - 800, MAX_ORDINAL + 1)]:
+        for full in [False, True]:
+            results = verify.verify(start = start, stop = stop, workers = 1, chunk_size = 500, full = full)
+            for checks in results.values():
+                assert checks == dict.fromkeys(verify.CHECKS)
+
+def test_verify_reports_first_mismatch(monkeypatch):
+    start = IFCDate(2000, 7, 1).toordinal()
+    # break fromisoformat from Sol 1 onwards
+    monkeypatch.setattr(IFCDate, 'fromisoformat', classmethod(lambda cls, s: cls(2000, 1, 1) if (s >= '2000-07') else cls(*map(int, s.split('-')))))
+    results = verify.verify([IFCDate], start = start - 100, stop = start + 100, workers = 1, full = True)
+    assert results[IFCDate]['ordinal'] is None
+    assert results[IFCDate]['isoformat'].ordinal == start
+
+def test_verify_detects_weekday_offset(monkeypatch):
+    # build the lookup tables before breaking weekday(), since they are cached
+    batch.tables(IFCDate)
+    weekday = IFCDate.weekday
+    # every month starting on Monday passes the continuity check, but not the reference check
+    monkeypatch.setattr(IFCDate, 'weekday', lambda self: weekday(self) if (weekday(self) >= 7) else (weekday(self) + 1) % 7)
+    start = IFCDate(2000, 1, 1).toordinal()
+    results = verify.verify([IFCDate], start = start, stop = start + 100, workers = 1, full = True)
+    assert results[IFCDate]['weekday'].ordinal == start
+
+def test_verify_samples_year_boundaries(monkeypatch):
+    start = IFCDate(2000, 1, 1).toordinal()
+    # break toordinal on New Year's Day, which is always checked, even without full = True
+    toordinal = IFCDate.toordinal
+    monkeypatch.setattr(IFCDate, 'toordinal', lambda self: toordinal(self) + ((self.month, self.day) == (1, 1)))
+    results = verify.verify([IFCDate], start = start - 100, stop = start + 100, workers = 1)
+    assert results[IFCDate]['ordinal'].ordinal == start